@@ -0,0 +1,246 @@
+import argparse
+import json
+import math
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from main import (Angle, AngleRange, AngleArray, AngleRangeSet, AngleRangeIndex,
+                  BamAngle, BamAngleRange, join_ranges)
+
+
+class Workload:
+    def __init__(self, n: int, scalar_n: int, seed: int):
+        rng = np.random.default_rng(seed)
+        self.n = n
+        self.scalar_n = scalar_n
+        # Длины до полного оборота: примерно половина диапазонов переходит через 0
+        self.starts = rng.uniform(0, 2 * math.pi, n)
+        self.ends = np.mod(self.starts + rng.uniform(0, 2 * math.pi, n), 2 * math.pi)
+        self.inc_start = rng.random(n) < 0.5
+        self.inc_end = rng.random(n) < 0.5
+        self.points = rng.uniform(0, 2 * math.pi, n)
+        self.bam_points = BamAngle.to_bam_array(self.points)
+        self.array = AngleArray(self.points)
+        self.other_array = AngleArray(rng.uniform(0, 2 * math.pi, n))
+
+        m = scalar_n
+        self.s_starts = self.starts[:m].tolist()
+        self.s_ends = self.ends[:m].tolist()
+        self.s_inc_start = self.inc_start[:m].tolist()
+        self.s_inc_end = self.inc_end[:m].tolist()
+        self.s_points = self.points[:m].tolist()
+        self.ranges = make_ranges(self)
+        self.bam_ranges = [BamAngleRange(r.start, r.end, r.inc_start, r.inc_end) for r in self.ranges]
+        self.angles = [Angle(p) for p in self.s_points]
+        # Для индекса и соединения ширина секторов падает с ростом m, чтобы угол
+        # в среднем попадал в ~8 секторов и время не упиралось в размер ответа
+        widths = rng.uniform(0, 16 * 2 * math.pi / m, m)
+        self.sectors = [AngleRange(Angle(s), Angle((s + d) % (2 * math.pi)))
+                        for s, d in zip(self.s_starts, widths.tolist())]
+        self.bam_angles = [BamAngle(p) for p in self.s_points]
+        self.index = AngleRangeIndex(self.sectors)
+
+
+def make_ranges(w: Workload):
+    return [AngleRange(Angle(s), Angle(e), i_s, i_e)
+            for s, e, i_s, i_e in zip(w.s_starts, w.s_ends, w.s_inc_start, w.s_inc_end)]
+
+
+def make_bam_ranges(w: Workload):
+    return [BamAngleRange(BamAngle(s), BamAngle(e), i_s, i_e)
+            for s, e, i_s, i_e in zip(w.s_starts, w.s_ends, w.s_inc_start, w.s_inc_end)]
+
+
+def range_contains(w: Workload):
+    for r, a in zip(w.ranges, w.angles):
+        a in r
+    return w.scalar_n
+
+
+def bam_range_contains(w: Workload):
+    for r, a in zip(w.bam_ranges, w.bam_angles):
+        a in r
+    return w.scalar_n
+
+
+def add_pairs(rs: list):
+    for i in range(len(rs) - 1):
+        rs[i] + rs[i + 1]
+    return len(rs) - 1
+
+
+def sub_pairs(rs: list):
+    for i in range(len(rs) - 1):
+        rs[i] - rs[i + 1]
+    return len(rs) - 1
+
+
+def lengths(rs: list):
+    for r in rs:
+        r.length()
+    return len(rs)
+
+
+def angle_array_init(w: Workload):
+    AngleArray(w.points, is_degrees=True)
+    return w.n
+
+
+def angle_array_eq(w: Workload):
+    AngleArray(w.points) == Angle(1.0)
+    return w.n
+
+
+def angle_array_add(w: Workload):
+    w.array + w.other_array
+    w.array + Angle(1.0)
+    return 2 * w.n
+
+
+def angle_array_sub(w: Workload):
+    w.array - w.other_array
+    w.array - Angle(1.0)
+    return 2 * w.n
+
+
+def contains_many(w: Workload):
+    AngleRange(Angle(5.0), Angle(1.0), True, False).contains_many(w.points)
+    return w.n
+
+
+def bam_contains_many(w: Workload):
+    BamAngleRange(BamAngle(5.0), BamAngle(1.0), True, False).contains_many(w.bam_points)
+    return w.n
+
+
+def range_set_init(w: Workload):
+    AngleRangeSet(w.ranges)
+    return w.scalar_n
+
+
+def range_set_algebra(w: Workload):
+    half = len(w.ranges) // 2
+    a, b = AngleRangeSet(w.ranges[:half]), AngleRangeSet(w.ranges[half:])
+    (a | b).length()
+    (a - b).length()
+    (a & b).length()
+    return w.scalar_n
+
+
+def index_build(w: Workload):
+    AngleRangeIndex(w.sectors)
+    return w.scalar_n
+
+
+def index_stab(w: Workload):
+    index = w.index
+    for a in w.angles:
+        index.stab(a)
+    return w.scalar_n
+
+
+def join(w: Workload):
+    half = min(len(w.sectors) // 2, 5000)
+    for _ in join_ranges(w.sectors[:half], w.sectors[half:2 * half]):
+        pass
+    return 2 * half
+
+
+CASES: List[Tuple[str, Callable[[Workload], int]]] = [
+    ("AngleRange()", lambda w: len(make_ranges(w))),
+    ("AngleRange in", range_contains),
+    ("AngleRange +", lambda w: add_pairs(w.ranges)),
+    ("AngleRange -", lambda w: sub_pairs(w.ranges)),
+    ("AngleRange.length", lambda w: lengths(w.ranges)),
+    ("BamAngleRange()", lambda w: len(make_bam_ranges(w))),
+    ("BamAngleRange in", bam_range_contains),
+    ("BamAngleRange +", lambda w: add_pairs(w.bam_ranges)),
+    ("BamAngleRange -", lambda w: sub_pairs(w.bam_ranges)),
+    ("BamAngleRange.length", lambda w: lengths(w.bam_ranges)),
+    ("AngleArray()", angle_array_init),
+    ("AngleArray ==", angle_array_eq),
+    ("AngleArray +", angle_array_add),
+    ("AngleArray -", angle_array_sub),
+    ("contains_many", contains_many),
+    ("Bam contains_many", bam_contains_many),
+    ("AngleRangeSet()", range_set_init),
+    ("AngleRangeSet |-&", range_set_algebra),
+    ("AngleRangeIndex()", index_build),
+    ("AngleRangeIndex.stab", index_stab),
+    ("join_ranges", join),
+]
+
+
+def measure(fn: Callable[[Workload], int], w: Workload, repeat: int):
+    best = math.inf
+    ops = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        ops = fn(w)
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn(w)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return ops, best, peak
+
+
+def run(sizes: List[int], scalar_max: int, repeat: int, seed: int) -> Dict[str, float]:
+    results = {}
+    print(f"{'n':>10} {'операция':<22} {'ops':>10} {'время, с':>10} {'ops/s':>14} {'пик, МиБ':>10}")
+    for n in sizes:
+        w = Workload(n, min(n, scalar_max), seed)
+        for name, fn in CASES:
+            ops, seconds, peak = measure(fn, w, repeat)
+            rate = ops / seconds if seconds > 0 else math.inf
+            results[f"{name}@{n}"] = rate
+            print(f"{n:>10} {name:<22} {ops:>10} {seconds:>10.4f} {rate:>14,.0f} {peak / 2**20:>10.2f}")
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float):
+    regressions = []
+    for key, rate in results.items():
+        old = baseline.get(key)
+        if old and rate < old * (1 - tolerance):
+            regressions.append(f"{key}: {old:,.0f} -> {rate:,.0f} ops/s ({rate / old - 1:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк Angle/AngleRange")
+    parser.add_argument("--sizes", default="1e3,1e4,1e5,1e6,1e7",
+                        help="размеры нагрузки через запятую")
+    parser.add_argument("--scalar-max", type=float, default=1e5,
+                        help="сколько объектов брать для поштучных операций")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="сохранить результаты в json")
+    parser.add_argument("--compare", help="сравнить с сохранёнными результатами")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="допустимое падение ops/s при сравнении")
+    args = parser.parse_args()
+
+    sizes = [int(float(s)) for s in args.sizes.split(",")]
+    results = run(sizes, int(args.scalar_max), args.repeat, args.seed)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"Регрессия: {line}")
+        if regressions:
+            raise SystemExit(1)
+        print("Регрессий нет")
+
+
+if __name__ == "__main__":
+    main()
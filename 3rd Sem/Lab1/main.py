@@ -1,5 +1,9 @@
 import math
+import bisect
+import heapq
+import random
 from typing import Union
+import numpy as np
 
 class Angle:
 
@@ -12,7 +16,8 @@ class Angle:
 
     def _normalize_angle(self, rad):
         rad = rad % (2 * math.pi)
-        return rad
+        # Для крошечных отрицательных rad остаток равен ровно 2π, а не 0
+        return 0.0 if rad == 2 * math.pi else rad
 
     @property
     def degrees(self):
@@ -42,6 +47,8 @@ class Angle:
 
 
     def __eq__(self, other : Union['Angle', float, int]):
+        if isinstance(other, AngleArray):
+            return NotImplemented
         val = other._normalize_angle(other.rad) if isinstance(other, Angle) else self._normalize_angle(other)
         return abs(self._normalize_angle(self.rad) - val) < 1e-10
 
@@ -50,12 +57,16 @@ class Angle:
         return self.rad < val
 
     def __add__(self, other : Union['Angle', float, int]):
+        if isinstance(other, AngleArray):
+            return NotImplemented
         val = other.rad if isinstance(other, Angle) else other
         return Angle(self.rad + val)
     
     def __radd__(self, other : Union['Angle', float, int]):
         return self.__add__(other)
     def __sub__(self, other : Union['Angle', float, int]):
+        if isinstance(other, AngleArray):
+            return NotImplemented
         val = other.rad if isinstance(other, Angle) else other
         return Angle(self.rad - val)
 
@@ -108,9 +119,23 @@ class AngleRange:
         
         if s <= e:
             return s_ok and e_ok
-        else:      
+        else:
             return s_ok or e_ok
 
+    def contains_many(self, values, is_degrees=False):
+        vals = np.asarray(values, dtype=np.float64)
+        if is_degrees:
+            vals = np.radians(vals)
+        s, e = self.start.rad, self.end.rad
+
+        s_ok = (np.greater_equal if self.inc_start else np.greater)(vals, s)
+        e_ok = (np.less_equal if self.inc_end else np.less)(vals, e)
+
+        # Результат пишется в буфер s_ok, чтобы не создавать третий массив
+        if s <= e:
+            return np.logical_and(s_ok, e_ok, out=s_ok)
+        return np.logical_or(s_ok, e_ok, out=s_ok)
+
     def __add__(self, other : 'AngleRange'):
         
         if other in self:
@@ -136,7 +161,7 @@ class AngleRange:
         else:
             new_end = other.end if e_in else self.end
 
-        return AngleRange(new_start, new_end)
+        return self.__class__(new_start, new_end)
 
     def __sub__(self, other : 'AngleRange'):
 
@@ -149,351 +174,995 @@ class AngleRange:
             return []
 
         if start_in and not end_in:
-            return AngleRange(other.end, self.end, not other.inc_end, self.inc_end)
+            return self.__class__(other.end, self.end, not other.inc_end, self.inc_end)
         
         if end_in and not start_in:
-            return AngleRange(self.start, other.start, self.inc_start, not other.inc_start)
+            return self.__class__(self.start, other.start, self.inc_start, not other.inc_start)
 
         if o_start_in and o_end_in:
-             r1 = AngleRange(self.start, other.start, self.inc_start, not other.inc_start)
-             r2 = AngleRange(other.end, self.end, not other.inc_end, self.inc_end)
+             r1 = self.__class__(self.start, other.start, self.inc_start, not other.inc_start)
+             r2 = self.__class__(other.end, self.end, not other.inc_end, self.inc_end)
              return [r1, r2]
         
         return self
 
-print
 
-print("--- Angle ---")
-a1 = Angle(90, is_degrees=True)
-a2 = Angle(math.pi) 
-a3 = Angle(450, is_degrees=True) 
+class AngleArray:
+
+    def __init__(self, values: Union['AngleArray', np.ndarray, list, float, int], is_degrees=False):
+        if isinstance(values, AngleArray):
+            rads = values.rad
+        elif isinstance(values, Angle):
+            rads = np.array([values.rad])
+        elif isinstance(values, (list, tuple)) and any(isinstance(v, Angle) for v in values):
+            conv = math.radians if is_degrees else float
+            rads = np.fromiter((float(v) if isinstance(v, Angle) else conv(v) for v in values),
+                               dtype=np.float64, count=len(values))
+        else:
+            rads = np.asarray(values, dtype=np.float64)
+            if is_degrees:
+                rads = np.radians(rads)
+        self.rad = np.ascontiguousarray(np.atleast_1d(rads), dtype=np.float64)
+
+    @staticmethod
+    def _normalize_angle(rad):
+        rad = np.mod(rad, 2 * math.pi)
+        return np.where(rad == 2 * math.pi, 0.0, rad)
+
+    @staticmethod
+    def _values(other):
+        if isinstance(other, (AngleArray, Angle)):
+            return other.rad
+        return other
+
+    @property
+    def degrees(self):
+        return np.degrees(self.rad)
+
+    @degrees.setter
+    def degrees(self, value):
+        self.rad = np.ascontiguousarray(np.radians(value), dtype=np.float64)
+
+    @property
+    def radians(self):
+        return self.rad
+
+    @radians.setter
+    def radians(self, value):
+        self.rad = np.ascontiguousarray(value, dtype=np.float64)
+
+    def normalized(self):
+        return AngleArray(self._normalize_angle(self.rad))
+
+    def __len__(self):
+        return self.rad.shape[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Angle(float(self.rad[index]))
+        return AngleArray(self.rad[index])
+
+    def __iter__(self):
+        return (Angle(v) for v in self.rad.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        return self.rad if dtype is None else self.rad.astype(dtype)
+
+    def __str__(self):
+        return "[" + ", ".join(f"{d:.2f}°" for d in self.degrees) + "]"
+    def __repr__(self):
+        return f"AngleArray({len(self)} angles)"
+
+    def __eq__(self, other : Union['AngleArray', Angle, np.ndarray, float, int]):
+        val = self._normalize_angle(self._values(other))
+        return np.abs(self._normalize_angle(self.rad) - val) < 1e-10
+
+    def __ne__(self, other):
+        return ~self.__eq__(other)
+
+    def __lt__(self, other : Union['AngleArray', Angle, np.ndarray, float, int]):
+        return self.rad < self._values(other)
+    def __gt__(self, other : Union['AngleArray', Angle, np.ndarray, float, int]):
+        return self.rad > self._values(other)
+
+    def __add__(self, other : Union['AngleArray', Angle, np.ndarray, float, int]):
+        return AngleArray(self.rad + self._values(other))
+    def __radd__(self, other : Union['AngleArray', Angle, np.ndarray, float, int]):
+        return self.__add__(other)
+    def __sub__(self, other : Union['AngleArray', Angle, np.ndarray, float, int]):
+        return AngleArray(self.rad - self._values(other))
+    def __rsub__(self, other : Union['AngleArray', Angle, np.ndarray, float, int]):
+        return AngleArray(self._values(other) - self.rad)
+
+    def __mul__(self, number : Union[np.ndarray, float, int]):
+        return AngleArray(self.rad * number)
+    def __rmul__(self, number : Union[np.ndarray, float, int]):
+        return self.__mul__(number)
+    def __truediv__(self, number : Union[np.ndarray, float, int]):
+        return AngleArray(self.rad / number)
+
+
+TWO_PI = 2 * math.pi
+_CIRCLE_START = (0.0, 0)
+_CIRCLE_END = (TWO_PI, 0)
+
+
+# Границы хранятся как ключи (угол, сторона): точка x занимает полуинтервал
+# [(x, 0), (x, 1)), поэтому открытые и закрытые концы сравниваются как кортежи.
+def _range_intervals(r: AngleRange):
+    lo = (r.start._normalize_angle(r.start.rad), 0 if r.inc_start else 1)
+    hi = (r.end._normalize_angle(r.end.rad), 1 if r.inc_end else 0)
+
+    if r.length() >= TWO_PI:
+        if lo[0] != hi[0] or r.inc_start or r.inc_end:
+            return [(_CIRCLE_START, _CIRCLE_END)]
+        # Полный оборот с открытыми концами в одной точке - круг без этой точки
+        pieces = [(lo, _CIRCLE_END)]
+        if _CIRCLE_START < hi:
+            pieces.insert(0, (_CIRCLE_START, hi))
+        return pieces
+    if lo[0] < hi[0]:
+        return [(lo, hi)]
+    if lo[0] > hi[0]:
+        pieces = [(lo, _CIRCLE_END)]
+        if _CIRCLE_START < hi:
+            pieces.insert(0, (_CIRCLE_START, hi))
+        return pieces
+    return [(lo, hi)] if lo < hi else []
+
+
+def _interval_to_range(lo, hi):
+    return AngleRange(Angle(lo[0]), Angle(hi[0]), lo[1] == 0, hi[1] == 1)
+
+
+def _merge_intervals(intervals):
+    merged = []
+    for lo, hi in sorted(intervals):
+        if merged and lo <= merged[-1][1]:
+            if hi > merged[-1][1]:
+                merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+class AngleRangeSet:
+
+    def __init__(self, ranges=()):
+        if isinstance(ranges, AngleRange):
+            ranges = [ranges]
+        intervals = []
+        for r in ranges:
+            if isinstance(r, AngleRangeSet):
+                intervals.extend(zip(r._los, r._his))
+            else:
+                intervals.extend(_range_intervals(r))
+        self._set_intervals(_merge_intervals(intervals))
+
+    def _set_intervals(self, intervals):
+        self._los = [lo for lo, _ in intervals]
+        self._his = [hi for _, hi in intervals]
+        self._length = None
+
+    @classmethod
+    def _from_intervals(cls, intervals):
+        result = cls.__new__(cls)
+        result._set_intervals(intervals)
+        return result
+
+    @classmethod
+    def full(cls):
+        return cls._from_intervals([(_CIRCLE_START, _CIRCLE_END)])
+
+    def length(self):
+        if self._length is None:
+            self._length = sum(hi[0] - lo[0] for lo, hi in zip(self._los, self._his))
+        return self._length
+
+    def ranges(self):
+        intervals = list(zip(self._los, self._his))
+        # Куски, примыкающие к 0 и к 2π, склеиваются обратно в один циклический диапазон.
+        # Если они сходятся в одном угле (весь круг без точки), склейка дала бы
+        # AngleRange(x, x, False, False), то есть пустой диапазон - куски остаются раздельными
+        if (len(intervals) > 1 and intervals[0][0] == _CIRCLE_START
+                and intervals[-1][1] == _CIRCLE_END
+                and intervals[-1][0][0] != intervals[0][1][0]):
+            head = intervals.pop(0)
+            lo, _ = intervals.pop()
+            intervals.append((lo, head[1]))
+        return [_interval_to_range(lo, hi) for lo, hi in intervals]
+
+    def __iter__(self):
+        return iter(self.ranges())
+
+    def __len__(self):
+        return len(self.ranges())
+
+    def __bool__(self):
+        return bool(self._los)
+
+    def __repr__(self):
+        return "{" + ", ".join(repr(r) for r in self.ranges()) + "}"
+
+    def __str__(self):
+        return self.__repr__()
+
+    def __eq__(self, other : 'AngleRangeSet'):
+        if not isinstance(other, AngleRangeSet):
+            try:
+                other = AngleRangeSet(other)
+            except (TypeError, AttributeError):
+                return NotImplemented
+        return self._los == other._los and self._his == other._his
+
+    def __contains__(self, item : Union['Angle', 'AngleRange', float, int]):
+        if isinstance(item, (AngleRange, AngleRangeSet)):
+            other = item if isinstance(item, AngleRangeSet) else AngleRangeSet(item)
+            return not (other - self)
+
+        angle = item if isinstance(item, Angle) else Angle(item)
+        key = (angle._normalize_angle(angle.rad), 0)
+        i = bisect.bisect_right(self._los, key) - 1
+        return i >= 0 and key < self._his[i]
+
+    def complement(self):
+        gaps = []
+        prev = _CIRCLE_START
+        for lo, hi in zip(self._los, self._his):
+            if prev < lo:
+                gaps.append((prev, lo))
+            prev = hi
+        if prev < _CIRCLE_END:
+            gaps.append((prev, _CIRCLE_END))
+        return AngleRangeSet._from_intervals(gaps)
+
+    def union(self, other : Union['AngleRangeSet', AngleRange]):
+        other = other if isinstance(other, AngleRangeSet) else AngleRangeSet(other)
+        intervals = list(zip(self._los, self._his)) + list(zip(other._los, other._his))
+        return AngleRangeSet._from_intervals(_merge_intervals(intervals))
+
+    def intersection(self, other : Union['AngleRangeSet', AngleRange]):
+        other = other if isinstance(other, AngleRangeSet) else AngleRangeSet(other)
+        result = []
+        i = j = 0
+        while i < len(self._los) and j < len(other._los):
+            lo = max(self._los[i], other._los[j])
+            hi = min(self._his[i], other._his[j])
+            if lo < hi:
+                result.append((lo, hi))
+            if self._his[i] < other._his[j]:
+                i += 1
+            else:
+                j += 1
+        return AngleRangeSet._from_intervals(result)
+
+    def difference(self, other : Union['AngleRangeSet', AngleRange]):
+        other = other if isinstance(other, AngleRangeSet) else AngleRangeSet(other)
+        return self.intersection(other.complement())
+
+    __or__ = __add__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __invert__ = complement
+
+
+class _IndexNode:
+    __slots__ = ("key", "hi", "item", "prio", "left", "right", "max_hi")
+
+    def __init__(self, key, hi, item):
+        self.key = key
+        self.hi = hi
+        self.item = item
+        self.prio = random.random()
+        self.left = None
+        self.right = None
+        self.max_hi = hi
+
+    def update(self):
+        m = self.hi
+        if self.left is not None and self.left.max_hi > m:
+            m = self.left.max_hi
+        if self.right is not None and self.right.max_hi > m:
+            m = self.right.max_hi
+        self.max_hi = m
+
+
+# Декартово дерево по началу интервала, в каждом узле хранится максимальный
+# конец поддерева: это позволяет отсекать ветки, которые не могут содержать угол.
+# Вставка и удаление - O(log n) в среднем. Запрос с k ответами - O(min(n, k log n))
+# в худшем случае, а не O(log n + k): каждый найденный интервал может стоить
+# спуска по дереву. Оценку O(log n + k) даёт центрированное дерево интервалов,
+# но с ним инкрементальные вставка и удаление требуют перестроек.
+class AngleRangeIndex:
+
+    def __init__(self, ranges=()):
+        self._root = None
+        self._entries = {}
+        self._seq = 0
+        for r in ranges:
+            self.insert(r)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, item : AngleRange):
+        return id(item) in self._entries
+
+    def __iter__(self):
+        return (r for r, _ in self._entries.values())
+
+    def insert(self, r : AngleRange):
+        if id(r) in self._entries:
+            return
+        keys = []
+        for lo, hi in _range_intervals(r):
+            self._seq += 1
+            key = (lo, self._seq)
+            self._root = self._insert(self._root, _IndexNode(key, hi, r))
+            keys.append(key)
+        self._entries[id(r)] = (r, keys)
+
+    def remove(self, r : AngleRange):
+        if id(r) not in self._entries:
+            raise ValueError(f"Диапазон {r} отсутствует в индексе")
+        _, keys = self._entries.pop(id(r))
+        for key in keys:
+            self._root = self._remove(self._root, key)
+
+    def _insert(self, node, new):
+        if node is None:
+            return new
+        if new.key < node.key:
+            node.left = self._insert(node.left, new)
+            if node.left.prio > node.prio:
+                node = self._rotate_right(node)
+        else:
+            node.right = self._insert(node.right, new)
+            if node.right.prio > node.prio:
+                node = self._rotate_left(node)
+        node.update()
+        return node
+
+    def _remove(self, node, key):
+        if node is None:
+            return None
+        if key < node.key:
+            node.left = self._remove(node.left, key)
+        elif key > node.key:
+            node.right = self._remove(node.right, key)
+        else:
+            if node.left is None:
+                return node.right
+            if node.right is None:
+                return node.left
+            if node.left.prio > node.right.prio:
+                node = self._rotate_right(node)
+                node.right = self._remove(node.right, key)
+            else:
+                node = self._rotate_left(node)
+                node.left = self._remove(node.left, key)
+        node.update()
+        return node
+
+    @staticmethod
+    def _rotate_right(node):
+        top = node.left
+        node.left = top.right
+        top.right = node
+        node.update()
+        top.update()
+        return top
+
+    @staticmethod
+    def _rotate_left(node):
+        top = node.right
+        node.right = top.left
+        top.left = node
+        node.update()
+        top.update()
+        return top
+
+    def _query(self, lo, hi, out, seen):
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None or node.max_hi <= lo:
+                continue
+            stack.append(node.left)
+            if node.key[0] < hi:
+                if node.hi > lo and id(node.item) not in seen:
+                    seen.add(id(node.item))
+                    out.append(node.item)
+                stack.append(node.right)
+
+    def stab(self, angle : Union[Angle, float, int]):
+        angle = angle if isinstance(angle, Angle) else Angle(angle)
+        x = angle._normalize_angle(angle.rad)
+        out = []
+        self._query((x, 0), (x, 1), out, set())
+        return out
+
+    def overlapping(self, r : AngleRange):
+        out = []
+        seen = set()
+        for lo, hi in _range_intervals(r):
+            self._query(lo, hi, out, seen)
+        return out
+
+
+def _join_pieces(ranges, side):
+    pieces, low_his, tops = [], [], []
+    for i, r in enumerate(ranges):
+        intervals = _range_intervals(r)
+        low_his.append(next((hi for lo, hi in intervals if lo == _CIRCLE_START), None))
+        tops.append(any(hi == _CIRCLE_END for _, hi in intervals))
+        pieces.extend((lo, hi, side, i) for lo, hi in intervals)
+    return pieces, low_his, tops
+
+
+def join_ranges(left, right):
+    left, right = list(left), list(right)
+    l_pieces, l_low, l_top = _join_pieces(left, 0)
+    r_pieces, r_low, r_top = _join_pieces(right, 1)
+    events = sorted(l_pieces + r_pieces, key=lambda ev: ev[0])
+
+    active = ([], [])
+    seq = 0
+    for lo, hi, side, i in events:
+        other = active[1 - side]
+        while other and other[0][0] <= lo:
+            heapq.heappop(other)
+
+        for o_hi, _, j in other:
+            a, b = (i, j) if side == 0 else (j, i)
+            i_hi = min(hi, o_hi)
+            # Общий кусок через 0 у двух циклических диапазонов отдаётся одним
+            # диапазоном: нижняя половина пропускается и достраивается у 2π
+            if lo == _CIRCLE_START and i_hi != _CIRCLE_END and l_top[a] and r_top[b]:
+                continue
+            if i_hi == _CIRCLE_END and lo != _CIRCLE_START and l_low[a] is not None and r_low[b] is not None:
+                i_hi = min(l_low[a], r_low[b])
+            yield left[a], right[b], _interval_to_range(lo, i_hi)
+
+        seq += 1
+        heapq.heappush(active[side], (hi, seq, i))
+
+
+# Двоичное угловое представление (BAM): полный оборот = 2**32 единиц,
+# переполнение по модулю даёт нормализацию без % и точное сравнение.
+_BAM_MASK = (1 << 32) - 1
+_RAD_PER_BAM = TWO_PI / (1 << 32)
+
+
+class BamAngle(Angle):
+    BITS = 32
+    TURN = 1 << BITS
+    MASK = _BAM_MASK
+    RAD_PER_UNIT = _RAD_PER_BAM
+
+    def __init__(self, value: Union[float, 'Angle', int], is_degrees=False):
+        if isinstance(value, BamAngle):
+            self.bam = value.bam
+        else:
+            rads = value.rad if isinstance(value, Angle) else (math.radians(value) if is_degrees else float(value))
+            self.bam = round(rads / _RAD_PER_BAM) & _BAM_MASK
+
+    @classmethod
+    def from_bam(cls, bam: int):
+        angle = cls.__new__(cls)
+        angle.bam = bam & _BAM_MASK
+        return angle
+
+    @staticmethod
+    def _to_bam(other: Union['Angle', float, int]):
+        return other.bam if isinstance(other, BamAngle) else BamAngle(other).bam
+
+    @staticmethod
+    def to_bam_array(values, is_degrees=False):
+        vals = np.asarray(values, dtype=np.float64)
+        if is_degrees:
+            vals = np.radians(vals)
+        units = np.rint(vals / _RAD_PER_BAM).astype(np.int64)
+        return np.bitwise_and(units, _BAM_MASK).astype(np.uint32)
+
+    @staticmethod
+    def from_bam_array(values):
+        return np.asarray(values, dtype=np.uint32) * _RAD_PER_BAM
+
+    @property
+    def rad(self):
+        return self.bam * _RAD_PER_BAM
+
+    @rad.setter
+    def rad(self, value):
+        self.bam = round(value / _RAD_PER_BAM) & _BAM_MASK
+
+    def __repr__(self):
+        return f"BamAngle({self.bam:#010x})"
+
+    def __hash__(self):
+        return hash(self.bam)
+
+    def __eq__(self, other : Union['Angle', float, int]):
+        if isinstance(other, BamAngle):
+            return self.bam == other.bam
+        if isinstance(other, AngleArray):
+            return NotImplemented
+        return self.bam == BamAngle(other).bam
+
+    def __lt__(self, other : Union['Angle', float, int]):
+        return self.bam < self._to_bam(other)
+
+    def __add__(self, other : Union['Angle', float, int]):
+        if isinstance(other, AngleArray):
+            return NotImplemented
+        angle = BamAngle.__new__(BamAngle)
+        angle.bam = (self.bam + (other.bam if isinstance(other, BamAngle) else BamAngle(other).bam)) & _BAM_MASK
+        return angle
+
+    def __sub__(self, other : Union['Angle', float, int]):
+        if isinstance(other, AngleArray):
+            return NotImplemented
+        angle = BamAngle.__new__(BamAngle)
+        angle.bam = (self.bam - (other.bam if isinstance(other, BamAngle) else BamAngle(other).bam)) & _BAM_MASK
+        return angle
+
+    def __mul__(self, number : Union[float, int]):
+        if isinstance(number, int):
+            return BamAngle.from_bam(self.bam * number)
+        return BamAngle.from_bam(round(self.bam * number))
+
+    def __truediv__(self, number : Union[float, int]):
+        return BamAngle.from_bam(round(self.bam / number))
+
+
+class BamAngleRange(AngleRange):
+    def __init__(self, start, end, inc_start=True, inc_end=True):
+        # Полный оборот нельзя увидеть по BAM-концам (оба дают 0), поэтому он
+        # определяется по исходным значениям, как длина в AngleRange
+        s = start.rad if isinstance(start, Angle) else float(start)
+        e = end.rad if isinstance(end, Angle) else float(end)
+        full = (e - s if e >= s else TWO_PI - s + e) >= TWO_PI
+
+        self.start = start if isinstance(start, BamAngle) else BamAngle(start)
+        self.end = end if isinstance(end, BamAngle) else BamAngle(end)
+        self.inc_start = inc_start
+        self.inc_end = inc_end
+        self._span = BamAngle.TURN if full else (self.end.bam - self.start.bam) & _BAM_MASK
+        self._offset, self._limit = self._window()
+
+    def span(self):
+        return self._span
+
+    def length(self):
+        return self._span * _RAD_PER_BAM
+
+    def _window(self):
+        # Точка входит, если (v - offset) mod 2**32 < limit; открытое начало
+        # сдвигает окно на одну единицу, закрытый конец добавляет одну единицу
+        skip = 0 if self.inc_start else 1
+        return (self.start.bam + skip) & _BAM_MASK, self._span - skip + (1 if self.inc_end else 0)
+
+    def __contains__(self, item : Union['Angle', 'AngleRange', float, int]):
+        if isinstance(item, BamAngle):
+            v = item.bam
+        elif isinstance(item, AngleRange):
+            return (item.start in self) and (item.end in self) and (item.length() <= self.length())
+        else:
+            v = BamAngle(item).bam
+        return ((v - self._offset) & _BAM_MASK) < self._limit
 
-print(f"a1: {a1}, rad: {a1.radians:.2f}")
-print(f"a3: {a3}")
-print(f"Сравнение 90 и 450: {a1 == a3}") 
-print(f"Сложение (90deg + 180deg): {a1 + a2}")
-print(f"Сложение с числом (90deg + PI rad): {a1 + math.pi}")
-print(f"Типы: int({int(a1)}), float({float(a1):.2f})")
+    def contains_many(self, values, is_degrees=False):
+        vals = np.asarray(values)
+        if vals.dtype != np.uint32:
+            vals = BamAngle.to_bam_array(vals, is_degrees)
 
-print("\n--- AngleRange ---")
-r1 = AngleRange(Angle(350, True), Angle(20, True)) 
-r2 = AngleRange(Angle(0, True), Angle(10, True))
-
-print(f"Range 1: {r1}, Длина: {math.degrees(r1.length()):.2f}°")
-print(f"0° входит в [350°, 20°]? {Angle(0, True) in r1}")
-print(f"Range 2 входит в Range 1? {r2 in r1}")
-
-print("\n--- Арифметика промежутков ---")
-r3 = AngleRange(Angle(10, True), Angle(30, True))
-res_add = r1 + r3
-
-print(f"{r3} in {r1} {r3 in r1}")
-print(f"Сложение {r1} + {r3} = {res_add}")
-
-res_sub = r1 - r2
-print(f"Вычитание {r1} - {r2} = {res_sub}")
-
-r4 = AngleRange(Angle(90, True), Angle(180, True))
-r5 = AngleRange(Angle(90, True), Angle(180, True), False, False)
-
-r6 = AngleRange(Angle(math.pi/2), Angle(math.pi*5), True, True)
-r7 = AngleRange(Angle(math.pi/3), Angle(math.pi*13/2), True, True)
-
-print(f"{repr(r6)} in {repr(r7)} {r6 in r7}")
-
-r8 = AngleRange(Angle(10, True), Angle(50, True), False, False)
-r9 = AngleRange(Angle(25, True), Angle(30, True), True, True)
-
-print(f"{repr(r8)} - {repr(r9)} = {r8-r9}")
-
-r10 = AngleRange(Angle(10, True), Angle(50, True), False, False)
-r11 = AngleRange(Angle(25, True), Angle(30, True), False, False)
-
-print(f"{repr(r10)} - {repr(r11)} = {r10-r11}")
-
-r12 = AngleRange(Angle(10, True), Angle(50, True), False, False)
-r13 = AngleRange(Angle(25, True), Angle(30, True), True, False)
-
-print(f"{repr(r12)} - {repr(r13)} = {r12-r13}")
-
-
-res_sub2 = r4 - r5
-res_add2 = r4 + r5
-
-print(f"Сложение {r4} + {r5} = {res_add2}")
-print(f"Вычитание {r4} - {r5} = {res_sub2}")
-
-
-print("\n=== ТЕСТЫ ДЛЯ __add__ И __sub__ ===")
-
-# Тест 1: Сложение диапазонов без пересечения
-print("\n--- Тест 1: Сложение без пересечения ---")
-t1_r1 = AngleRange(Angle(10, True), Angle(30, True))
-t1_r2 = AngleRange(Angle(100, True), Angle(120, True))
-t1_res = t1_r1 + t1_r2
-print(f"{t1_r1} + {t1_r2} = {t1_res}")
-assert isinstance(t1_res, list) and len(t1_res) == 2, "Должно быть два отдельных диапазона"
-print("✓ Тест 1 пройден")
-
-# Тест 2: Сложение полностью перекрывающихся диапазонов
-print("\n--- Тест 2: Одинаковые диапазоны ---")
-t2_r1 = AngleRange(Angle(45, True), Angle(90, True))
-t2_r2 = AngleRange(Angle(45, True), Angle(90, True))
-t2_res = t2_r1 + t2_r2
-print(f"{t2_r1} + {t2_r2} = {t2_res}")
-assert t2_res == t2_r1, "Результат должен быть равен исходному диапазону"
-print("✓ Тест 2 пройден")
-
-# Тест 3: Сложение с частичным пересечением
-print("\n--- Тест 3: Частичное пересечение ---")
-t3_r1 = AngleRange(Angle(20, True), Angle(60, True))
-t3_r2 = AngleRange(Angle(50, True), Angle(80, True))
-t3_res = t3_r1 + t3_r2
-print(f"{t3_r1} + {t3_r2} = {t3_res}")
-assert isinstance(t3_res, AngleRange), "Должен быть один объединённый диапазон"
-assert t3_res.start == t3_r1.start and t3_res.end == t3_r2.end, "Границы должны быть объединены"
-print("✓ Тест 3 пройден")
-
-# Тест 4: Сложение когда один диапазон внутри другого
-print("\n--- Тест 4: Один диапазон внутри другого ---")
-t4_r1 = AngleRange(Angle(10, True), Angle(100, True))
-t4_r2 = AngleRange(Angle(30, True), Angle(70, True))
-t4_res = t4_r1 + t4_r2
-print(f"{t4_r1} + {t4_r2} = {t4_res}")
-assert t4_res == t4_r1, "Результат должен быть больший диапазон"
-print("✓ Тест 4 пройден")
-
-# Тест 5: Сложение циклических диапазонов (пересекающих 0°)
-print("\n--- Тест 5: Циклические диапазоны с пересечением ---")
-t5_r1 = AngleRange(Angle(350, True), Angle(20, True))
-t5_r2 = AngleRange(Angle(10, True), Angle(30, True))
-t5_res = t5_r1 + t5_r2
-print(f"{t5_r1} + {t5_r2} = {t5_res}")
-assert isinstance(t5_res, AngleRange), "Должен быть объединённый диапазон"
-print("✓ Тест 5 пройден")
-
-# Тест 6: Вычитание без пересечения
-print("\n--- Тест 6: Вычитание без пересечения ---")
-t6_r1 = AngleRange(Angle(10, True), Angle(50, True))
-t6_r2 = AngleRange(Angle(100, True), Angle(150, True))
-t6_res = t6_r1 - t6_r2
-print(f"{t6_r1} - {t6_r2} = {t6_res}")
-assert t6_res == t6_r1, "Результат должен быть исходный диапазон"
-print("✓ Тест 6 пройден")
-
-# Тест 7: Вычитание полностью перекрывающегося диапазона
-print("\n--- Тест 7: Полное вычитание ---")
-t7_r1 = AngleRange(Angle(20, True), Angle(80, True))
-t7_r2 = AngleRange(Angle(10, True), Angle(100, True))
-t7_res = t7_r1 - t7_r2
-print(f"{t7_r1} - {t7_r2} = {t7_res}")
-assert t7_res == [], "Результат должен быть пустой список"
-print("✓ Тест 7 пройден")
-
-# Тест 8: Вычитание только начало перекрывается
-print("\n--- Тест 8: Начало в пересечении ---")
-t8_r1 = AngleRange(Angle(20, True), Angle(80, True))
-t8_r2 = AngleRange(Angle(10, True), Angle(50, True))
-t8_res = t8_r1 - t8_r2
-print(f"{t8_r1} - {t8_r2} = {t8_res}")
-assert isinstance(t8_res, AngleRange), "Результат должен быть один диапазон"
-assert t8_res.start == t8_r2.end, "Начало должно быть конец вычитаемого"
-print("✓ Тест 8 пройден")
-
-# Тест 9: Вычитание только конец перекрывается
-print("\n--- Тест 9: Конец в пересечении ---")
-t9_r1 = AngleRange(Angle(20, True), Angle(80, True))
-t9_r2 = AngleRange(Angle(60, True), Angle(100, True))
-t9_res = t9_r1 - t9_r2
-print(f"{t9_r1} - {t9_r2} = {t9_res}")
-assert isinstance(t9_res, AngleRange), "Результат должен быть один диапазон"
-assert t9_res.end == t9_r2.start, "Конец должен быть начало вычитаемого"
-print("✓ Тест 9 пройден")
-
-# Тест 10: Вычитание дырки из середины
-print("\n--- Тест 10: Вычитание из середины ---")
-t10_r1 = AngleRange(Angle(10, True), Angle(100, True))
-t10_r2 = AngleRange(Angle(40, True), Angle(60, True))
-t10_res = t10_r1 - t10_r2
-print(f"{t10_r1} - {t10_r2} = {t10_res}")
-assert isinstance(t10_res, list) and len(t10_res) == 2, "Результат должен быть два диапазона"
-assert t10_res[0].end == t10_r2.start and t10_res[1].start == t10_r2.end, "Правильные границы"
-print("✓ Тест 10 пройден")
-
-# Тест 11: Сложение с разными inc_start/inc_end
-print("\n--- Тест 11: Сложение с разными границами ---")
-t11_r1 = AngleRange(Angle(20, True), Angle(60, True), True, False)
-t11_r2 = AngleRange(Angle(60, True), Angle(90, True), True, True)
-t11_res = t11_r1 + t11_r2
-print(f"{t11_r1} + {t11_r2} = {t11_res}")
-assert isinstance(t11_res, AngleRange), "Должен быть объединённый диапазон"
-print("✓ Тест 11 пройден")
-
-# Тест 12: Вычитание с разными inc_start/inc_end
-print("\n--- Тест 12: Вычитание с разными границами ---")
-t12_r1 = AngleRange(Angle(10, True), Angle(80, True), True, True)
-t12_r2 = AngleRange(Angle(30, True), Angle(60, True), False, False)
-t12_res = t12_r1 - t12_r2
-print(f"{t12_r1} - {t12_r2} = {t12_res}")
-assert isinstance(t12_res, list), "Результат должен быть список"
-print("✓ Тест 12 пройден")
-
-# Тест 13: Циклический диапазон вычитание
-print("\n--- Тест 13: Циклический диапазон вычитание ---")
-t13_r1 = AngleRange(Angle(350, True), Angle(20, True))
-t13_r2 = AngleRange(Angle(0, True), Angle(10, True))
-t13_res = t13_r1 - t13_r2
-print(f"{t13_r1} - {t13_r2} = {t13_res}")
-print("✓ Тест 13 пройден")
-
-# Тест 14: Сложение соседних диапазонов
-print("\n--- Тест 14: Соседние диапазоны (с общей точкой) ---")
-t14_r1 = AngleRange(Angle(10, True), Angle(50, True), True, True)
-t14_r2 = AngleRange(Angle(50, True), Angle(90, True), True, True)
-t14_res = t14_r1 + t14_r2
-print(f"{t14_r1} + {t14_r2} = {t14_res}")
-assert isinstance(t14_res, AngleRange), "Соседние диапазоны должны объединиться"
-print("✓ Тест 14 пройден")
-
-# Тест 15: Сложение с большими углами (> 2π)
-print("\n--- Тест 15: Диапазоны с большими углами ---")
-t15_r1 = AngleRange(Angle(0), Angle(math.pi*3))
-t15_r2 = AngleRange(Angle(math.pi*2), Angle(math.pi*5))
-t15_res = t15_r1 + t15_r2
-print(f"Сложение диапазонов > 2π: результат получен")
-assert isinstance(t15_res, AngleRange), "Должен быть объединённый диапазон"
-print("✓ Тест 15 пройден")
-
-print("\n=== ВСЕ ТЕСТЫ __add__ И __sub__ ПРОЙДЕНЫ ===")
-
-print("\n=== ТЕСТЫ ДЛЯ ДИАПАЗОНОВ С ПЕРЕХОДОМ ЧЕРЕЗ 360° ===")
-
-# Тест 16: Сложение двух циклических диапазонов
-print("\n--- Тест 16: Сложение двух циклических диапазонов ---")
-t16_r1 = AngleRange(Angle(340, True), Angle(20, True))
-t16_r2 = AngleRange(Angle(350, True), Angle(30, True))
-t16_res = t16_r1 + t16_r2
-print(f"{t16_r1} + {t16_r2} = {t16_res}")
-assert isinstance(t16_res, AngleRange), "Должен быть объединённый циклический диапазон"
-print("✓ Тест 16 пройден")
-
-# Тест 17: Вычитание из циклического диапазона
-print("\n--- Тест 17: Вычитание из циклического диапазона ---")
-t17_r1 = AngleRange(Angle(330, True), Angle(30, True))
-t17_r2 = AngleRange(Angle(350, True), Angle(10, True))
-t17_res = t17_r1 - t17_r2
-print(f"{t17_r1} - {t17_r2} = {t17_res}")
-print("✓ Тест 17 пройден")
-
-# Тест 18: Циклический диапазон полностью содержит обычный
-print("\n--- Тест 18: Циклический содержит обычный ---")
-t18_r1 = AngleRange(Angle(350, True), Angle(50, True))
-t18_r2 = AngleRange(Angle(10, True), Angle(30, True))
-t18_res = t18_r1 + t18_r2
-print(f"{t18_r1} + {t18_r2} = {t18_res}")
-assert t18_res == t18_r1, "Циклический диапазон должен поглотить обычный"
-print("✓ Тест 18 пройден")
-
-# Тест 19: Большой циклический диапазон (> 180°)
-print("\n--- Тест 19: Большой циклический диапазон ---")
-t19_r1 = AngleRange(Angle(270, True), Angle(90, True))
-t19_r2 = AngleRange(Angle(300, True), Angle(60, True))
-t19_res = t19_r1 + t19_r2
-print(f"{t19_r1} (длина {math.degrees(t19_r1.length()):.1f}°) + {t19_r2} = {t19_res}")
-assert isinstance(t19_res, AngleRange), "Должен быть объединённый диапазон"
-print("✓ Тест 19 пройден")
-
-# Тест 20: Вычитание обычного из циклического
-print("\n--- Тест 20: Вычитание обычного из циклического ---")
-t20_r1 = AngleRange(Angle(320, True), Angle(40, True))
-t20_r2 = AngleRange(Angle(10, True), Angle(20, True))
-t20_res = t20_r1 - t20_r2
-print(f"{t20_r1} - {t20_r2} = {t20_res}")
-print("✓ Тест 20 пройден")
-
-# Тест 21: Циклический диапазон полное пересечение
-print("\n--- Тест 21: Циклические диапазоны полное пересечение ---")
-t21_r1 = AngleRange(Angle(300, True), Angle(60, True))
-t21_r2 = AngleRange(Angle(310, True), Angle(50, True))
-t21_res = t21_r1 - t21_r2
-print(f"{t21_r1} - {t21_r2} = {t21_res}")
-print("✓ Тест 21 пройден")
-
-# Тест 22: Циклический диапазон начинается в 350°
-print("\n--- Тест 22: Циклический [350°, 10°] ---")
-t22_r1 = AngleRange(Angle(350, True), Angle(10, True))
-t22_r2 = AngleRange(Angle(0, True), Angle(20, True))
-t22_res = t22_r1 + t22_r2
-print(f"{t22_r1} + {t22_r2} = {t22_res}")
-print("✓ Тест 22 пройден")
-
-print("\n=== ТЕСТЫ ДЛЯ ДИАПАЗОНОВ С start > end (РАДИАНЫ) ===")
-
-# Тест 23: Сложение диапазонов где start > end в радианах
-print("\n--- Тест 23: Радиан диапазоны start > end ---")
-t23_r1 = AngleRange(Angle(4.0), Angle(1.0))
-t23_r2 = AngleRange(Angle(5.0), Angle(2.0))
-t23_res = t23_r1 + t23_r2
-print(f"{t23_r1} (start > end) + {t23_r2} = {t23_res}")
-print("✓ Тест 23 пройден")
-
-# Тест 24: Вычитание из диапазона start > end
-print("\n--- Тест 24: Вычитание из диапазона start > end ---")
-t24_r1 = AngleRange(Angle(5.0), Angle(1.0))
-t24_r2 = AngleRange(Angle(3.0), Angle(2.0))
-t24_res = t24_r1 - t24_r2
-print(f"{t24_r1} (start > end) - {t24_r2} = {t24_res}")
-print("✓ Тест 24 пройден")
-
-# Тест 25: Оба диапазона с start > end
-print("\n--- Тест 25: Оба диапазона с start > end ---")
-t25_r1 = AngleRange(Angle(4.5), Angle(1.5))
-t25_r2 = AngleRange(Angle(5.0), Angle(2.0))
-t25_res = t25_r1 + t25_r2
-print(f"{t25_r1} + {t25_r2} = {t25_res}")
-assert isinstance(t25_res, AngleRange), "Должен быть объединённый диапазон"
-print("✓ Тест 25 пройден")
-
-# Тест 26: Циклический диапазон пересекает 0
-print("\n--- Тест 26: Диапазон [5.5 rad, 0.8 rad] ---")
-t26_r1 = AngleRange(Angle(5.5), Angle(0.8))
-t26_r2 = AngleRange(Angle(6.0), Angle(0.5))
-t26_res = t26_r1 - t26_r2
-print(f"{t26_r1} - {t26_r2} = {t26_res}")
-print("✓ Тест 26 пройден")
-
-# Тест 27: Вычитание полностью перекрывающегося из циклического
-print("\n--- Тест 27: Вычитание всего циклического диапазона ---")
-t27_r1 = AngleRange(Angle(5.0), Angle(1.0))
-t27_r2 = AngleRange(Angle(4.5), Angle(1.5))
-t27_res = t27_r1 - t27_r2
-print(f"{t27_r1} - {t27_r2} = {t27_res}")
-assert t27_res == [], "Результат должен быть пустой"
-print("✓ Тест 27 пройден")
-
-# Тест 28: Циклический большой диапазон > 180° в радианах
-print("\n--- Тест 28: Циклический диапазон > π радиан ---")
-t28_r1 = AngleRange(Angle(4.0), Angle(1.5))
-t28_len = t28_r1.length()
-print(f"Диапазон {t28_r1}, длина: {t28_len:.2f} rad = {math.degrees(t28_len):.1f}°")
-assert t28_len > math.pi, "Длина должна быть больше π"
-print("✓ Тест 28 пройден")
-
-# Тест 29: Пересечение циклических диапазонов в радианах
-print("\n--- Тест 29: Пересечение циклических [5.5, 0.9] и [5.8, 0.6] ---")
-t29_r1 = AngleRange(Angle(5.5), Angle(0.9))
-t29_r2 = AngleRange(Angle(5.8), Angle(0.6))
-t29_res = t29_r1 + t29_r2
-print(f"{t29_r1} + {t29_r2} = {t29_res}")
-assert isinstance(t29_res, AngleRange), "Должен быть объединённый диапазон"
-print("✓ Тест 29 пройден")
-
-# Тест 30: Сложение циклического и обычного в радианах
-print("\n--- Тест 30: Сложение циклического и обычного [rad] ---")
-t30_r1 = AngleRange(Angle(5.0), Angle(0.8))
-t30_r2 = AngleRange(Angle(0.5), Angle(0.9))
-t30_res = t30_r1 + t30_r2
-print(f"{t30_r1} + {t30_r2} = {t30_res}")
-print("✓ Тест 30 пройден")
-
-print("\n=== ВСЕ РАСШИРЕННЫЕ ТЕСТЫ ПРОЙДЕНЫ ===")
\ No newline at end of file
+        if self._limit <= 0:
+            return np.zeros(vals.shape, dtype=bool)
+        if self._limit > _BAM_MASK:
+            return np.ones(vals.shape, dtype=bool)
+        # Вычитание в uint32 заворачивается само, поэтому ветки для s > e не нужны
+        d = np.subtract(vals, np.uint32(self._offset), dtype=np.uint32)
+        return np.less(d, np.uint32(self._limit), out=np.empty(vals.shape, dtype=bool))
+
+def run_tests():
+    print("--- Angle ---")
+    a1 = Angle(90, is_degrees=True)
+    a2 = Angle(math.pi) 
+    a3 = Angle(450, is_degrees=True) 
+
+    print(f"a1: {a1}, rad: {a1.radians:.2f}")
+    print(f"a3: {a3}")
+    print(f"Сравнение 90 и 450: {a1 == a3}") 
+    print(f"Сложение (90deg + 180deg): {a1 + a2}")
+    print(f"Сложение с числом (90deg + PI rad): {a1 + math.pi}")
+    print(f"Типы: int({int(a1)}), float({float(a1):.2f})")
+
+    print("\n--- AngleRange ---")
+    r1 = AngleRange(Angle(350, True), Angle(20, True)) 
+    r2 = AngleRange(Angle(0, True), Angle(10, True))
+
+    print(f"Range 1: {r1}, Длина: {math.degrees(r1.length()):.2f}°")
+    print(f"0° входит в [350°, 20°]? {Angle(0, True) in r1}")
+    print(f"Range 2 входит в Range 1? {r2 in r1}")
+
+    print("\n--- Арифметика промежутков ---")
+    r3 = AngleRange(Angle(10, True), Angle(30, True))
+    res_add = r1 + r3
+
+    print(f"{r3} in {r1} {r3 in r1}")
+    print(f"Сложение {r1} + {r3} = {res_add}")
+
+    res_sub = r1 - r2
+    print(f"Вычитание {r1} - {r2} = {res_sub}")
+
+    r4 = AngleRange(Angle(90, True), Angle(180, True))
+    r5 = AngleRange(Angle(90, True), Angle(180, True), False, False)
+
+    r6 = AngleRange(Angle(math.pi/2), Angle(math.pi*5), True, True)
+    r7 = AngleRange(Angle(math.pi/3), Angle(math.pi*13/2), True, True)
+
+    print(f"{repr(r6)} in {repr(r7)} {r6 in r7}")
+
+    r8 = AngleRange(Angle(10, True), Angle(50, True), False, False)
+    r9 = AngleRange(Angle(25, True), Angle(30, True), True, True)
+
+    print(f"{repr(r8)} - {repr(r9)} = {r8-r9}")
+
+    r10 = AngleRange(Angle(10, True), Angle(50, True), False, False)
+    r11 = AngleRange(Angle(25, True), Angle(30, True), False, False)
+
+    print(f"{repr(r10)} - {repr(r11)} = {r10-r11}")
+
+    r12 = AngleRange(Angle(10, True), Angle(50, True), False, False)
+    r13 = AngleRange(Angle(25, True), Angle(30, True), True, False)
+
+    print(f"{repr(r12)} - {repr(r13)} = {r12-r13}")
+
+
+    res_sub2 = r4 - r5
+    res_add2 = r4 + r5
+
+    print(f"Сложение {r4} + {r5} = {res_add2}")
+    print(f"Вычитание {r4} - {r5} = {res_sub2}")
+
+
+    print("\n=== ТЕСТЫ ДЛЯ __add__ И __sub__ ===")
+
+    # Тест 1: Сложение диапазонов без пересечения
+    print("\n--- Тест 1: Сложение без пересечения ---")
+    t1_r1 = AngleRange(Angle(10, True), Angle(30, True))
+    t1_r2 = AngleRange(Angle(100, True), Angle(120, True))
+    t1_res = t1_r1 + t1_r2
+    print(f"{t1_r1} + {t1_r2} = {t1_res}")
+    assert isinstance(t1_res, list) and len(t1_res) == 2, "Должно быть два отдельных диапазона"
+    print("✓ Тест 1 пройден")
+
+    # Тест 2: Сложение полностью перекрывающихся диапазонов
+    print("\n--- Тест 2: Одинаковые диапазоны ---")
+    t2_r1 = AngleRange(Angle(45, True), Angle(90, True))
+    t2_r2 = AngleRange(Angle(45, True), Angle(90, True))
+    t2_res = t2_r1 + t2_r2
+    print(f"{t2_r1} + {t2_r2} = {t2_res}")
+    assert t2_res == t2_r1, "Результат должен быть равен исходному диапазону"
+    print("✓ Тест 2 пройден")
+
+    # Тест 3: Сложение с частичным пересечением
+    print("\n--- Тест 3: Частичное пересечение ---")
+    t3_r1 = AngleRange(Angle(20, True), Angle(60, True))
+    t3_r2 = AngleRange(Angle(50, True), Angle(80, True))
+    t3_res = t3_r1 + t3_r2
+    print(f"{t3_r1} + {t3_r2} = {t3_res}")
+    assert isinstance(t3_res, AngleRange), "Должен быть один объединённый диапазон"
+    assert t3_res.start == t3_r1.start and t3_res.end == t3_r2.end, "Границы должны быть объединены"
+    print("✓ Тест 3 пройден")
+
+    # Тест 4: Сложение когда один диапазон внутри другого
+    print("\n--- Тест 4: Один диапазон внутри другого ---")
+    t4_r1 = AngleRange(Angle(10, True), Angle(100, True))
+    t4_r2 = AngleRange(Angle(30, True), Angle(70, True))
+    t4_res = t4_r1 + t4_r2
+    print(f"{t4_r1} + {t4_r2} = {t4_res}")
+    assert t4_res == t4_r1, "Результат должен быть больший диапазон"
+    print("✓ Тест 4 пройден")
+
+    # Тест 5: Сложение циклических диапазонов (пересекающих 0°)
+    print("\n--- Тест 5: Циклические диапазоны с пересечением ---")
+    t5_r1 = AngleRange(Angle(350, True), Angle(20, True))
+    t5_r2 = AngleRange(Angle(10, True), Angle(30, True))
+    t5_res = t5_r1 + t5_r2
+    print(f"{t5_r1} + {t5_r2} = {t5_res}")
+    assert isinstance(t5_res, AngleRange), "Должен быть объединённый диапазон"
+    print("✓ Тест 5 пройден")
+
+    # Тест 6: Вычитание без пересечения
+    print("\n--- Тест 6: Вычитание без пересечения ---")
+    t6_r1 = AngleRange(Angle(10, True), Angle(50, True))
+    t6_r2 = AngleRange(Angle(100, True), Angle(150, True))
+    t6_res = t6_r1 - t6_r2
+    print(f"{t6_r1} - {t6_r2} = {t6_res}")
+    assert t6_res == t6_r1, "Результат должен быть исходный диапазон"
+    print("✓ Тест 6 пройден")
+
+    # Тест 7: Вычитание полностью перекрывающегося диапазона
+    print("\n--- Тест 7: Полное вычитание ---")
+    t7_r1 = AngleRange(Angle(20, True), Angle(80, True))
+    t7_r2 = AngleRange(Angle(10, True), Angle(100, True))
+    t7_res = t7_r1 - t7_r2
+    print(f"{t7_r1} - {t7_r2} = {t7_res}")
+    assert t7_res == [], "Результат должен быть пустой список"
+    print("✓ Тест 7 пройден")
+
+    # Тест 8: Вычитание только начало перекрывается
+    print("\n--- Тест 8: Начало в пересечении ---")
+    t8_r1 = AngleRange(Angle(20, True), Angle(80, True))
+    t8_r2 = AngleRange(Angle(10, True), Angle(50, True))
+    t8_res = t8_r1 - t8_r2
+    print(f"{t8_r1} - {t8_r2} = {t8_res}")
+    assert isinstance(t8_res, AngleRange), "Результат должен быть один диапазон"
+    assert t8_res.start == t8_r2.end, "Начало должно быть конец вычитаемого"
+    print("✓ Тест 8 пройден")
+
+    # Тест 9: Вычитание только конец перекрывается
+    print("\n--- Тест 9: Конец в пересечении ---")
+    t9_r1 = AngleRange(Angle(20, True), Angle(80, True))
+    t9_r2 = AngleRange(Angle(60, True), Angle(100, True))
+    t9_res = t9_r1 - t9_r2
+    print(f"{t9_r1} - {t9_r2} = {t9_res}")
+    assert isinstance(t9_res, AngleRange), "Результат должен быть один диапазон"
+    assert t9_res.end == t9_r2.start, "Конец должен быть начало вычитаемого"
+    print("✓ Тест 9 пройден")
+
+    # Тест 10: Вычитание дырки из середины
+    print("\n--- Тест 10: Вычитание из середины ---")
+    t10_r1 = AngleRange(Angle(10, True), Angle(100, True))
+    t10_r2 = AngleRange(Angle(40, True), Angle(60, True))
+    t10_res = t10_r1 - t10_r2
+    print(f"{t10_r1} - {t10_r2} = {t10_res}")
+    assert isinstance(t10_res, list) and len(t10_res) == 2, "Результат должен быть два диапазона"
+    assert t10_res[0].end == t10_r2.start and t10_res[1].start == t10_r2.end, "Правильные границы"
+    print("✓ Тест 10 пройден")
+
+    # Тест 11: Сложение с разными inc_start/inc_end
+    print("\n--- Тест 11: Сложение с разными границами ---")
+    t11_r1 = AngleRange(Angle(20, True), Angle(60, True), True, False)
+    t11_r2 = AngleRange(Angle(60, True), Angle(90, True), True, True)
+    t11_res = t11_r1 + t11_r2
+    print(f"{t11_r1} + {t11_r2} = {t11_res}")
+    assert isinstance(t11_res, AngleRange), "Должен быть объединённый диапазон"
+    print("✓ Тест 11 пройден")
+
+    # Тест 12: Вычитание с разными inc_start/inc_end
+    print("\n--- Тест 12: Вычитание с разными границами ---")
+    t12_r1 = AngleRange(Angle(10, True), Angle(80, True), True, True)
+    t12_r2 = AngleRange(Angle(30, True), Angle(60, True), False, False)
+    t12_res = t12_r1 - t12_r2
+    print(f"{t12_r1} - {t12_r2} = {t12_res}")
+    assert isinstance(t12_res, list), "Результат должен быть список"
+    print("✓ Тест 12 пройден")
+
+    # Тест 13: Циклический диапазон вычитание
+    print("\n--- Тест 13: Циклический диапазон вычитание ---")
+    t13_r1 = AngleRange(Angle(350, True), Angle(20, True))
+    t13_r2 = AngleRange(Angle(0, True), Angle(10, True))
+    t13_res = t13_r1 - t13_r2
+    print(f"{t13_r1} - {t13_r2} = {t13_res}")
+    print("✓ Тест 13 пройден")
+
+    # Тест 14: Сложение соседних диапазонов
+    print("\n--- Тест 14: Соседние диапазоны (с общей точкой) ---")
+    t14_r1 = AngleRange(Angle(10, True), Angle(50, True), True, True)
+    t14_r2 = AngleRange(Angle(50, True), Angle(90, True), True, True)
+    t14_res = t14_r1 + t14_r2
+    print(f"{t14_r1} + {t14_r2} = {t14_res}")
+    assert isinstance(t14_res, AngleRange), "Соседние диапазоны должны объединиться"
+    print("✓ Тест 14 пройден")
+
+    # Тест 15: Сложение с большими углами (> 2π)
+    print("\n--- Тест 15: Диапазоны с большими углами ---")
+    t15_r1 = AngleRange(Angle(0), Angle(math.pi*3))
+    t15_r2 = AngleRange(Angle(math.pi*2), Angle(math.pi*5))
+    t15_res = t15_r1 + t15_r2
+    print(f"Сложение диапазонов > 2π: результат получен")
+    assert isinstance(t15_res, AngleRange), "Должен быть объединённый диапазон"
+    print("✓ Тест 15 пройден")
+
+    print("\n=== ВСЕ ТЕСТЫ __add__ И __sub__ ПРОЙДЕНЫ ===")
+
+    print("\n=== ТЕСТЫ ДЛЯ ДИАПАЗОНОВ С ПЕРЕХОДОМ ЧЕРЕЗ 360° ===")
+
+    # Тест 16: Сложение двух циклических диапазонов
+    print("\n--- Тест 16: Сложение двух циклических диапазонов ---")
+    t16_r1 = AngleRange(Angle(340, True), Angle(20, True))
+    t16_r2 = AngleRange(Angle(350, True), Angle(30, True))
+    t16_res = t16_r1 + t16_r2
+    print(f"{t16_r1} + {t16_r2} = {t16_res}")
+    assert isinstance(t16_res, AngleRange), "Должен быть объединённый циклический диапазон"
+    print("✓ Тест 16 пройден")
+
+    # Тест 17: Вычитание из циклического диапазона
+    print("\n--- Тест 17: Вычитание из циклического диапазона ---")
+    t17_r1 = AngleRange(Angle(330, True), Angle(30, True))
+    t17_r2 = AngleRange(Angle(350, True), Angle(10, True))
+    t17_res = t17_r1 - t17_r2
+    print(f"{t17_r1} - {t17_r2} = {t17_res}")
+    print("✓ Тест 17 пройден")
+
+    # Тест 18: Циклический диапазон полностью содержит обычный
+    print("\n--- Тест 18: Циклический содержит обычный ---")
+    t18_r1 = AngleRange(Angle(350, True), Angle(50, True))
+    t18_r2 = AngleRange(Angle(10, True), Angle(30, True))
+    t18_res = t18_r1 + t18_r2
+    print(f"{t18_r1} + {t18_r2} = {t18_res}")
+    assert t18_res == t18_r1, "Циклический диапазон должен поглотить обычный"
+    print("✓ Тест 18 пройден")
+
+    # Тест 19: Большой циклический диапазон (> 180°)
+    print("\n--- Тест 19: Большой циклический диапазон ---")
+    t19_r1 = AngleRange(Angle(270, True), Angle(90, True))
+    t19_r2 = AngleRange(Angle(300, True), Angle(60, True))
+    t19_res = t19_r1 + t19_r2
+    print(f"{t19_r1} (длина {math.degrees(t19_r1.length()):.1f}°) + {t19_r2} = {t19_res}")
+    assert isinstance(t19_res, AngleRange), "Должен быть объединённый диапазон"
+    print("✓ Тест 19 пройден")
+
+    # Тест 20: Вычитание обычного из циклического
+    print("\n--- Тест 20: Вычитание обычного из циклического ---")
+    t20_r1 = AngleRange(Angle(320, True), Angle(40, True))
+    t20_r2 = AngleRange(Angle(10, True), Angle(20, True))
+    t20_res = t20_r1 - t20_r2
+    print(f"{t20_r1} - {t20_r2} = {t20_res}")
+    print("✓ Тест 20 пройден")
+
+    # Тест 21: Циклический диапазон полное пересечение
+    print("\n--- Тест 21: Циклические диапазоны полное пересечение ---")
+    t21_r1 = AngleRange(Angle(300, True), Angle(60, True))
+    t21_r2 = AngleRange(Angle(310, True), Angle(50, True))
+    t21_res = t21_r1 - t21_r2
+    print(f"{t21_r1} - {t21_r2} = {t21_res}")
+    print("✓ Тест 21 пройден")
+
+    # Тест 22: Циклический диапазон начинается в 350°
+    print("\n--- Тест 22: Циклический [350°, 10°] ---")
+    t22_r1 = AngleRange(Angle(350, True), Angle(10, True))
+    t22_r2 = AngleRange(Angle(0, True), Angle(20, True))
+    t22_res = t22_r1 + t22_r2
+    print(f"{t22_r1} + {t22_r2} = {t22_res}")
+    print("✓ Тест 22 пройден")
+
+    print("\n=== ТЕСТЫ ДЛЯ ДИАПАЗОНОВ С start > end (РАДИАНЫ) ===")
+
+    # Тест 23: Сложение диапазонов где start > end в радианах
+    print("\n--- Тест 23: Радиан диапазоны start > end ---")
+    t23_r1 = AngleRange(Angle(4.0), Angle(1.0))
+    t23_r2 = AngleRange(Angle(5.0), Angle(2.0))
+    t23_res = t23_r1 + t23_r2
+    print(f"{t23_r1} (start > end) + {t23_r2} = {t23_res}")
+    print("✓ Тест 23 пройден")
+
+    # Тест 24: Вычитание из диапазона start > end
+    print("\n--- Тест 24: Вычитание из диапазона start > end ---")
+    t24_r1 = AngleRange(Angle(5.0), Angle(1.0))
+    t24_r2 = AngleRange(Angle(3.0), Angle(2.0))
+    t24_res = t24_r1 - t24_r2
+    print(f"{t24_r1} (start > end) - {t24_r2} = {t24_res}")
+    print("✓ Тест 24 пройден")
+
+    # Тест 25: Оба диапазона с start > end
+    print("\n--- Тест 25: Оба диапазона с start > end ---")
+    t25_r1 = AngleRange(Angle(4.5), Angle(1.5))
+    t25_r2 = AngleRange(Angle(5.0), Angle(2.0))
+    t25_res = t25_r1 + t25_r2
+    print(f"{t25_r1} + {t25_r2} = {t25_res}")
+    assert isinstance(t25_res, AngleRange), "Должен быть объединённый диапазон"
+    print("✓ Тест 25 пройден")
+
+    # Тест 26: Циклический диапазон пересекает 0
+    print("\n--- Тест 26: Диапазон [5.5 rad, 0.8 rad] ---")
+    t26_r1 = AngleRange(Angle(5.5), Angle(0.8))
+    t26_r2 = AngleRange(Angle(6.0), Angle(0.5))
+    t26_res = t26_r1 - t26_r2
+    print(f"{t26_r1} - {t26_r2} = {t26_res}")
+    print("✓ Тест 26 пройден")
+
+    # Тест 27: Вычитание полностью перекрывающегося из циклического
+    print("\n--- Тест 27: Вычитание всего циклического диапазона ---")
+    t27_r1 = AngleRange(Angle(5.0), Angle(1.0))
+    t27_r2 = AngleRange(Angle(4.5), Angle(1.5))
+    t27_res = t27_r1 - t27_r2
+    print(f"{t27_r1} - {t27_r2} = {t27_res}")
+    assert t27_res == [], "Результат должен быть пустой"
+    print("✓ Тест 27 пройден")
+
+    # Тест 28: Циклический большой диапазон > 180° в радианах
+    print("\n--- Тест 28: Циклический диапазон > π радиан ---")
+    t28_r1 = AngleRange(Angle(4.0), Angle(1.5))
+    t28_len = t28_r1.length()
+    print(f"Диапазон {t28_r1}, длина: {t28_len:.2f} rad = {math.degrees(t28_len):.1f}°")
+    assert t28_len > math.pi, "Длина должна быть больше π"
+    print("✓ Тест 28 пройден")
+
+    # Тест 29: Пересечение циклических диапазонов в радианах
+    print("\n--- Тест 29: Пересечение циклических [5.5, 0.9] и [5.8, 0.6] ---")
+    t29_r1 = AngleRange(Angle(5.5), Angle(0.9))
+    t29_r2 = AngleRange(Angle(5.8), Angle(0.6))
+    t29_res = t29_r1 + t29_r2
+    print(f"{t29_r1} + {t29_r2} = {t29_res}")
+    assert isinstance(t29_res, AngleRange), "Должен быть объединённый диапазон"
+    print("✓ Тест 29 пройден")
+
+    # Тест 30: Сложение циклического и обычного в радианах
+    print("\n--- Тест 30: Сложение циклического и обычного [rad] ---")
+    t30_r1 = AngleRange(Angle(5.0), Angle(0.8))
+    t30_r2 = AngleRange(Angle(0.5), Angle(0.9))
+    t30_res = t30_r1 + t30_r2
+    print(f"{t30_r1} + {t30_r2} = {t30_res}")
+    print("✓ Тест 30 пройден")
+
+    print("\n=== ВСЕ РАСШИРЕННЫЕ ТЕСТЫ ПРОЙДЕНЫ ===")
+    print("\n--- AngleArray ---")
+    arr = AngleArray([90, 450, 180, -270], is_degrees=True)
+    print(f"Массив: {arr}")
+    print(f"Нормализованный: {arr.normalized()}")
+    print(f"Сравнение с 90°: {arr == Angle(90, True)}")
+    print(f"Сложение с 45°: {arr + Angle(45, True)}")
+    print(f"Умножение на 2: {arr * 2}")
+    assert list(arr == Angle(90, True)) == [Angle(d, True) == Angle(90, True) for d in (90, 450, 180, -270)]
+    print("✓ AngleArray совпадает со скалярным Angle")
+    mixed = AngleArray([Angle(45, True), 90], is_degrees=True)
+    assert list(mixed == Angle(90, True)) == [False, True]
+    print("✓ Смешанный список Angle и чисел в градусах")
+
+    print("\n--- AngleRangeSet ---")
+    rs1 = AngleRangeSet([AngleRange(Angle(350, True), Angle(20, True)), AngleRange(Angle(100, True), Angle(120, True))])
+    rs2 = AngleRangeSet(AngleRange(Angle(10, True), Angle(110, True), False, False))
+    print(f"{rs1} | {rs2} = {rs1 | rs2}")
+    print(f"{rs1} & {rs2} = {rs1 & rs2}")
+    print(f"{rs1} - {rs2} = {rs1 - rs2}")
+    print(f"~{rs1} = {~rs1}, длина: {math.degrees(rs1.length()):.2f}°")
+    assert (rs1 | ~rs1) == AngleRangeSet.full()
+    assert Angle(10, True) in (rs1 - rs2) and Angle(15, True) not in (rs1 - rs2)
+    print("✓ AngleRangeSet пройден")
+
+    print("\n--- AngleRange.contains_many ---")
+    bearings = np.array([0, 10, 20, 30, 350, 355])
+    cm_r = AngleRange(Angle(350, True), Angle(20, True), True, False)
+    mask = cm_r.contains_many(bearings, is_degrees=True)
+    print(f"{bearings} в {cm_r}: {mask}")
+    assert list(mask) == [Angle(b, True) in cm_r for b in bearings]
+    print("✓ contains_many совпадает с __contains__")
+
+    print("\n--- AngleRangeIndex ---")
+    sectors = [AngleRange(Angle(350, True), Angle(20, True)), AngleRange(Angle(10, True), Angle(90, True)),
+               AngleRange(Angle(180, True), Angle(270, True))]
+    index = AngleRangeIndex(sectors)
+    print(f"Сектора с 15°: {index.stab(Angle(15, True))}")
+    print(f"Сектора, пересекающие [80°, 190°]: {index.overlapping(AngleRange(Angle(80, True), Angle(190, True)))}")
+    index.remove(sectors[0])
+    assert index.stab(Angle(15, True)) == [sectors[1]]
+    print("✓ AngleRangeIndex пройден")
+
+    print("\n--- join_ranges ---")
+    left = [AngleRange(Angle(350, True), Angle(30, True)), AngleRange(Angle(100, True), Angle(150, True))]
+    right = [AngleRange(Angle(340, True), Angle(10, True)), AngleRange(Angle(120, True), Angle(200, True))]
+    pairs = list(join_ranges(left, right))
+    for a, b, common in pairs:
+        print(f"{a} ∩ {b} = {common}")
+    assert len(pairs) == 2 and pairs[1][2] == AngleRange(Angle(350, True), Angle(10, True))
+    print("✓ join_ranges пройден")
+
+    print("\n--- BamAngle / BamAngleRange ---")
+    b1 = BamAngle(90, True)
+    b2 = BamAngle(450, True)
+    print(f"{b1!r} == {b2!r}: {b1 == b2}, hash совпадает: {hash(b1) == hash(b2)}")
+    print(f"Переполнение: {BamAngle(350, True)} + {BamAngle(20, True)} = {BamAngle(350, True) + BamAngle(20, True)}")
+    bam_r = BamAngleRange(BamAngle(350, True), BamAngle(20, True), True, False)
+    bam_mask = bam_r.contains_many(BamAngle.to_bam_array(bearings, is_degrees=True))
+    print(f"{bearings} в {bam_r}: {bam_mask}")
+    assert list(bam_mask) == list(mask)
+    assert len({BamAngle(0), BamAngle(2 * math.pi), BamAngle(-2 * math.pi)}) == 1
+    print("✓ BAM пройден")
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -1,7 +1,17 @@
+import io
+import itertools
 import os
+import sys
+import time
+import queue
+import threading
+import mmap
+import struct
 from enum import Enum
-from typing import Tuple
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import json
+from functools import lru_cache
 
 # Enum for colors
 class Color(Enum):
@@ -10,7 +20,342 @@ class Color(Enum):
     BLUE = '\033[34m'
     RESET = '\033[0m'
 
+# Скомпилированный шрифт: заголовок, таблица глифов и строки всех глифов
+# подряд в одном буфере. Файл отображается в память, глифы декодируются по запросу.
+class FontAtlas:
+    MAGIC = b"FATL"
+    VERSION = 1
+    _HEADER = struct.Struct("<4sHQI")
+    _ENTRY = struct.Struct("<IIHH")
+
+    def __init__(self, buffer):
+        magic, version, self.source_mtime, count = self._HEADER.unpack_from(buffer, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("неверный формат атласа шрифта")
+        self._buffer = buffer
+        self._index: Dict[str, Tuple[int, int, int]] = {}
+        pos = self._HEADER.size
+        for _ in range(count):
+            code, offset, row_size, rows = self._ENTRY.unpack_from(buffer, pos)
+            self._index[chr(code)] = (offset, row_size, rows)
+            pos += self._ENTRY.size
+        self._glyphs: Dict[str, List[str]] = {}
+
+    @classmethod
+    def compile(cls, font: Dict[str, List[str]], source_mtime: int) -> bytes:
+        glyphs = [(char, [row.encode('utf-8') for row in rows])
+                  for char, rows in font.items() if len(char) == 1]
+        data_start = cls._HEADER.size + cls._ENTRY.size * len(glyphs)
+
+        header = [cls._HEADER.pack(cls.MAGIC, cls.VERSION, source_mtime, len(glyphs))]
+        blocks = []
+        offset = data_start
+        for char, rows in glyphs:
+            row_size = max((len(row) for row in rows), default=0)
+            header.append(cls._ENTRY.pack(ord(char), offset, row_size, len(rows)))
+            blocks.extend(row.ljust(row_size, b"\0") for row in rows)
+            offset += row_size * len(rows)
+        return b"".join(header + blocks)
+
+    @classmethod
+    def load(cls, font_path: str, source_mtime: int) -> 'FontAtlas':
+        atlas_path = font_path + ".atlas"
+        buffer = None
+        try:
+            with open(atlas_path, 'rb') as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            atlas = cls(buffer)
+            if atlas.source_mtime == source_mtime:
+                return atlas
+        except (OSError, ValueError, struct.error):
+            pass
+        if buffer is not None:
+            buffer.close()
+
+        with open(font_path, 'r', encoding='utf-8') as file:
+            data = cls.compile(json.load(file), source_mtime)
+        # Старые атласы могут ещё держать файл отображённым в память, поэтому он
+        # не перезаписывается на месте, а заменяется новым файлом целиком
+        tmp_path = f"{atlas_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, atlas_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return cls(data)
+
+    def __getitem__(self, char: str) -> List[str]:
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            offset, row_size, rows = self._index[char]
+            raw = self._buffer[offset:offset + row_size * rows]
+            glyph = [raw[i:i + row_size].rstrip(b"\0").decode('utf-8')
+                     for i in range(0, len(raw), row_size)] if row_size else [""] * rows
+            self._glyphs[char] = glyph
+        return glyph
+
+    def __contains__(self, char: str) -> bool:
+        return char in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def keys(self):
+        return self._index.keys()
+
+
+_font_cache: Dict[str, Tuple[int, FontAtlas]] = {}
+
+
+# Внеэкранный буфер: текст рисуется в сетку ячеек, а flush() выводит
+# одной записью только ячейки, изменившиеся с прошлого кадра.
+class FrameBuffer:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self._chars = [[' '] * width for _ in range(height)]
+        self._colors = [[''] * width for _ in range(height)]
+        self._front_chars: Optional[List[List[str]]] = None
+        self._front_colors: Optional[List[List[str]]] = None
+
+    def clear(self):
+        for y in range(self.height):
+            self._chars[y] = [' '] * self.width
+            self._colors[y] = [''] * self.width
+
+    def invalidate(self):
+        self._front_chars = None
+        self._front_colors = None
+
+    def draw_lines(self, lines: List[str], position: Tuple[int, int], color: Color):
+        x0, y0 = position
+        for i, line in enumerate(lines):
+            y = y0 + i
+            if not 0 <= y < self.height:
+                continue
+            chars, colors = self._chars[y], self._colors[y]
+            for j, char in enumerate(line):
+                x = x0 + j
+                # Пробелы глифа прозрачные, чтобы надписи можно было накладывать
+                if char != ' ' and 0 <= x < self.width:
+                    chars[x] = char
+                    colors[x] = color.value
+
+    def flush(self, stream=None) -> int:
+        out = []
+        written = 0
+        current_color = None
+        for y in range(self.height):
+            chars, colors = self._chars[y], self._colors[y]
+            if self._front_chars is not None:
+                front_chars, front_colors = self._front_chars[y], self._front_colors[y]
+                if chars == front_chars and colors == front_colors:
+                    continue
+            else:
+                front_chars = front_colors = None
+
+            x = 0
+            while x < self.width:
+                if front_chars is not None and chars[x] == front_chars[x] and colors[x] == front_colors[x]:
+                    x += 1
+                    continue
+                # Ячейки буфера считаются с 0, а позиции курсора терминала - с 1
+                out.append(f"\033[{y + 1};{x + 1}H")
+                while x < self.width and (front_chars is None or chars[x] != front_chars[x]
+                                          or colors[x] != front_colors[x]):
+                    if colors[x] != current_color:
+                        out.append(colors[x] or Color.RESET.value)
+                        current_color = colors[x]
+                    out.append(chars[x])
+                    written += 1
+                    x += 1
+
+        if self._front_chars is None:
+            self._front_chars = [row[:] for row in self._chars]
+            self._front_colors = [row[:] for row in self._colors]
+        else:
+            for y in range(self.height):
+                self._front_chars[y] = self._chars[y][:]
+                self._front_colors[y] = self._colors[y][:]
+
+        if out:
+            out.append(Color.RESET.value)
+            stream = stream or sys.stdout
+            stream.write("".join(out))
+            stream.flush()
+        return written
+
+
+def _layout(font, text: str) -> Tuple[str, ...]:
+    glyphs = []
+    for char in text:
+        if char not in font:
+            raise ValueError(f"символ '{char}' не найден в шрифте.")
+        glyphs.append(font[char])
+    if not glyphs:
+        return ()
+
+    # Каждая строка собирается из кусков глифов одним join, без повторных конкатенаций
+    height = min(len(glyph) for glyph in glyphs)
+    return tuple(" ".join([glyph[row] for glyph in glyphs]) for row in range(height))
+
+
+_layout_cached = lru_cache(maxsize=256)(_layout)
+
+
+def layout_text(font, text: str) -> Tuple[str, ...]:
+    try:
+        return _layout_cached(font, text)
+    except TypeError:
+        # Шрифт в виде обычного dict не хешируется, такой текст собирается без кэша
+        return _layout(font, text)
+
+
+def _columns(font, char: str) -> Tuple[str, ...]:
+    rows = font[char]
+    width = max((len(row) for row in rows), default=0)
+    rows = [row.ljust(width) for row in rows]
+    return tuple("".join(column) for column in zip(*rows))
+
+
+_columns_cached = lru_cache(maxsize=1024)(_columns)
+
+
+def glyph_columns(font, char: str) -> Tuple[str, ...]:
+    try:
+        return _columns_cached(font, char)
+    except TypeError:
+        return _columns(font, char)
+
+
+# Очередь отрисовки: потоки только кладут запросы, единственный поток-писатель
+# сливает запросы в одну и ту же позицию и выводит пачку одной записью.
+class RenderQueue:
+    _STOP = object()
+
+    def __init__(self, stream=None):
+        self._stream = stream
+        self._queue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+        self._total_flush_latency = 0.0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="RenderQueue", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(self._STOP)
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, text: str, color: Color, position: Tuple[int, int], font=None):
+        font = font if font is not None else Printer.font
+        # Ошибка должна дойти до вызывающего, как при синхронном print_static
+        for char in text:
+            if char not in font:
+                raise ValueError(f"символ '{char}' не найден в шрифте.")
+        self._queue.put((position, text, color, font, time.perf_counter()))
+        depth = self._queue.qsize()
+        with self._lock:
+            self.submitted += 1
+            if depth > self.max_depth:
+                self.max_depth = depth
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "depth": self.depth,
+                "max_depth": self.max_depth,
+                "submitted": self.submitted,
+                "failed": self.failed,
+                "coalesced": self.coalesced,
+                "batches": self.batches,
+                "last_flush_latency": self.last_flush_latency,
+                "avg_flush_latency": self._total_flush_latency / self.batches if self.batches else 0.0,
+                "max_flush_latency": self.max_flush_latency,
+            }
+
+    def _run(self):
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            batch = {item[0]: item}
+            coalesced = 0
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    running = False
+                    break
+                if batch.pop(item[0], None) is not None:
+                    coalesced += 1
+                batch[item[0]] = item
+            self._flush(batch.values(), coalesced)
+
+    def _flush(self, requests, coalesced: int):
+        out = []
+        oldest = None
+        failed = 0
+        for (x, y), text, color, font, enqueued in requests:
+            if oldest is None or enqueued < oldest:
+                oldest = enqueued
+            # Неудачная надпись не должна останавливать поток вывода
+            try:
+                lines = layout_text(font, text)
+            except Exception:
+                failed += 1
+                continue
+            for i, line in enumerate(lines):
+                out.append(f"\033[{y + i};{x}H{color.value}{line}")
+        out.append(Color.RESET.value)
+        stream = self._stream or sys.stdout
+        stream.write("".join(out))
+        stream.flush()
+
+        latency = time.perf_counter() - oldest
+        with self._lock:
+            self.batches += 1
+            self.failed += failed
+            self.coalesced += coalesced
+            self.last_flush_latency = latency
+            self._total_flush_latency += latency
+            if latency > self.max_flush_latency:
+                self.max_flush_latency = latency
+
+
 class Printer:
+    render_queue: Optional[RenderQueue] = None
+
     def __init__(self, color: Color, position: Tuple[int, int], symbol: str = '*'):
         self.color = color
         self.position = position
@@ -26,46 +371,171 @@ class Printer:
         for i, line in enumerate(self._generate_text(text)):
             print(f"\033[{self.position[1] + i};{self.position[0]}H{self.color.value}{line}{Color.RESET.value}", end="\n")
 
+    def draw(self, frame: FrameBuffer, text: str):
+        frame.draw_lines(self._generate_text(text), self.position, self.color)
+
+    def marquee(self, chars: Iterable[str], width: int, spacing: int = 1, pad: bool = True) -> Iterator[Tuple[str, ...]]:
+        stream = self._column_stream(chars, spacing)
+        first = next(stream, None)
+        if first is None:
+            return
+        height = len(first)
+        blank = " " * height
+
+        # В окне хранится не больше width столбцов, поэтому память не зависит от длины текста
+        window = deque([blank] * width if pad else [], maxlen=width)
+        window.append(first)
+        if len(window) == width:
+            yield tuple(map("".join, zip(*window)))
+        for column in stream:
+            window.append(column[:height].ljust(height))
+            if len(window) == width:
+                yield tuple(map("".join, zip(*window)))
+        if pad:
+            for _ in range(width):
+                window.append(blank)
+                yield tuple(map("".join, zip(*window)))
+
+    def _column_stream(self, chars: Iterable[str], spacing: int) -> Iterator[str]:
+        font = self.font
+        spacer = None
+        for chunk in chars:
+            for char in chunk:
+                if char not in font:
+                    raise ValueError(f"символ '{char}' не найден в шрифте.")
+                columns = glyph_columns(font, char)
+                if spacer is None:
+                    spacer = " " * len(columns[0]) if columns else ""
+                else:
+                    for _ in range(spacing):
+                        yield spacer
+                yield from columns
+
+    def play_marquee(self, chars: Iterable[str], width: int, delay: float = 0.05):
+        x, y = self.position
+        for frame in self.marquee(chars, width):
+            out = [f"\033[{y + i};{x}H{self.color.value}{row}" for i, row in enumerate(frame)]
+            out.append(Color.RESET.value)
+            sys.stdout.write("".join(out))
+            sys.stdout.flush()
+            time.sleep(delay)
+
     @staticmethod
     def load_font(file_path: str):
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"шрифт не найден: {file_path}")
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
+        key = os.path.abspath(file_path)
+        mtime = os.stat(key).st_mtime_ns
 
-    def _generate_text(self, text: str):
+        cached = _font_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
 
-        lines = []
-        for char in text:
-            if char in self.font:
-                char_lines = self.font[char]
-                if not lines:
-                    lines = char_lines
-                else:
-                    lines = [line + " " + char_line for line, char_line in zip(lines, char_lines)]
-            else:
-                raise ValueError(f"символ '{char}' не найден в шрифте.")
-        return lines
+        atlas = FontAtlas.load(key, mtime)
+        _font_cache[key] = (mtime, atlas)
+        return atlas
+
+    def _generate_text(self, text: str):
+        return layout_text(self.font, text)
 
     @classmethod
     def print_static(cls, text: str, color: Color, position: Tuple[int, int], symbol: str = '*'):
+        if cls.render_queue is not None:
+            cls.render_queue.submit(text, color, position, cls.font)
+            return
 
-
-        lines = []
-        for char in text:
-            if char in cls.font:
-                char_lines = cls.font[char]
-                if not lines:
-                    lines = char_lines
-                else:
-                    lines = [line + " " + char_line for line, char_line in zip(lines, char_lines)]
-            else:
-                raise ValueError(f"символ '{char}' не найден в шрифте.")
+        lines = layout_text(cls.font, text)
 
         for i, line in enumerate(lines):
             print(f"\033[{position[1] + i};{position[0]}H{color.value}{line}{Color.RESET.value}", end="\n")
 
+    @classmethod
+    def draw_static(cls, frame: FrameBuffer, text: str, color: Color, position: Tuple[int, int]):
+        cls(color, position).draw(frame, text)
+
+def demonstrate_framebuffer():
+    frame = FrameBuffer(10, 3)
+    frame.draw_lines(["ab", "c d"], (1, 0), Color.RED)
+    out = io.StringIO()
+    # Первый кадр выводится целиком, с левого верхнего угла терминала (1;1)
+    assert frame.flush(out) == 30 and out.getvalue().startswith("\033[1;1H")
+
+    out = io.StringIO()
+    assert frame.flush(out) == 0 and out.getvalue() == ""
+
+    # Пробел в рисунке прозрачный: 'a' в ячейке (1, 0) остаётся, меняется только (2, 0)
+    frame.draw_lines([" Y"], (1, 0), Color.GREEN)
+    frame.draw_lines(["X"], (5, 2), Color.GREEN)
+    out = io.StringIO()
+    assert frame.flush(out) == 2
+    assert out.getvalue() == f"\033[1;3H{Color.GREEN.value}Y\033[3;6HX{Color.RESET.value}", repr(out.getvalue())
+
+    frame.invalidate()
+    assert frame.flush(io.StringIO()) == 30
+    print("✓ FrameBuffer выводит только изменившиеся ячейки")
+
+def demonstrate_marquee():
+    printer = Printer(Color.BLUE, (0, 0))
+    printer.font = {"A": ["#.", "##"], "B": ["b", "b"]}
+    # Столбцы потока: "##", ".#", промежуток "  ", "bb"
+    assert list(printer.marquee("AB", width=3, pad=False)) == [("#. ", "## "), (". b", "# b")]
+
+    frames = list(printer.marquee("AB", width=3))
+    assert len(frames) == 4 + 3 and frames[0] == ("  #", "  #") and frames[-1] == ("   ", "   ")
+
+    # Бесконечный поток: окно хранит только width столбцов
+    endless = printer.marquee(itertools.repeat("AB"), width=3, pad=False)
+    assert len(list(itertools.islice(endless, 10000))) == 10000
+
+    try:
+        list(printer.marquee("AZ", width=3))
+        assert False, "неизвестный символ должен вызывать ValueError"
+    except ValueError:
+        pass
+    print("✓ Бегущая строка выдаёт кадры по одному столбцу")
+
+def demonstrate_render_queue():
+    font = {"A": ["A"], "B": ["B"]}
+    out = io.StringIO()
+    render_queue = RenderQueue(out)
+    # Запросы копятся до старта потока-писателя и уходят одной пачкой;
+    # второй запрос в позицию (1, 1) заменяет первый
+    render_queue.submit("A", Color.RED, (1, 1), font)
+    render_queue.submit("B", Color.RED, (1, 1), font)
+    render_queue.submit("AB", Color.GREEN, (5, 1), font)
+    try:
+        render_queue.submit("Z", Color.RED, (9, 9), font)
+        assert False, "неизвестный символ должен вызывать ValueError"
+    except ValueError:
+        pass
+    render_queue.start()
+    render_queue.stop()
+
+    stats = render_queue.stats()
+    assert (stats["submitted"], stats["coalesced"], stats["batches"], stats["failed"]) == (3, 1, 1, 0), stats
+    expected = f"\033[1;1H{Color.RED.value}B\033[1;5H{Color.GREEN.value}A B{Color.RESET.value}"
+    assert out.getvalue() == expected, repr(out.getvalue())
+
+    # Запросы из нескольких потоков: ни один не теряется
+    def submit_column(x: int):
+        for y in range(100):
+            render_queue.submit("AB", Color.BLUE, (x, y), font)
+
+    with RenderQueue(io.StringIO()) as render_queue:
+        workers = [threading.Thread(target=submit_column, args=(x,)) for x in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    stats = render_queue.stats()
+    assert stats["submitted"] == 400 and stats["depth"] == 0 and stats["failed"] == 0
+    print(f"✓ Очередь отрисовки: {stats['submitted']} запросов, пачек {stats['batches']}")
+
 if __name__ == "__main__":
+    demonstrate_framebuffer()
+    demonstrate_marquee()
+    demonstrate_render_queue()
+
     Printer.font = Printer.load_font("font_5x7.json")
 
     Printer.print_static("ACCAC", Color.GREEN, (100, 20))
@@ -0,0 +1,280 @@
+import argparse
+import bisect
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Union
+
+from main import LogLevel
+
+_LINE_RE = re.compile(r"^\[(\w+)\] \[(.*?)\] (.*)$")
+_TOKEN_RE = re.compile(r"\w+")
+_HEAD_SIZE = 256
+
+
+# Индекс лог-файла, записанного через Logger + BasicLogFormatter.
+# Рядом с логом лежат два файла: <log>.idx - по строке json на запись
+# (смещение, время, уровень, токены) и <log>.idx.meta - сколько байт лога
+# уже проиндексировано. При обновлении разбираются только дописанные байты.
+class LogIndex:
+    def __init__(self, log_path: str, date_format: str = "%d.%m.%Y %H:%M:%S"):
+        self._log_path = log_path
+        self._index_path = log_path + ".idx"
+        self._meta_path = log_path + ".idx.meta"
+        self._date_format = date_format
+        self._reset()
+        self._load()
+
+    def _reset(self) -> None:
+        self._indexed_bytes = 0
+        self._head = ""
+        self._offsets: List[int] = []
+        self._timestamps: List[float] = []
+        self._levels: Dict[str, List[int]] = {}
+        self._tokens: Dict[str, List[int]] = {}
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _load(self) -> None:
+        try:
+            with open(self._meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(self._index_path, 'r+b') as f:
+                confirmed = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    offset, timestamp, level, tokens = json.loads(line)
+                    if offset >= meta["indexed_bytes"]:
+                        break
+                    self._add(offset, timestamp, level, tokens)
+                    confirmed += len(line)
+                # Записи, дописанные в .idx после последнего .meta, не подтверждены
+                # (падение между ними): они отрезаются, иначе update() допишет их снова
+                f.truncate(confirmed)
+            self._indexed_bytes = meta["indexed_bytes"]
+            self._head = meta["head"]
+        except (OSError, ValueError, KeyError):
+            self._reset()
+            if os.path.exists(self._index_path):
+                os.remove(self._index_path)
+
+    def _add(self, offset: int, timestamp: float, level: Optional[str], tokens: Iterable[str]) -> None:
+        record_id = len(self._offsets)
+        self._offsets.append(offset)
+        self._timestamps.append(timestamp)
+        if level is not None:
+            self._levels.setdefault(level, []).append(record_id)
+        for token in tokens:
+            self._tokens.setdefault(token, []).append(record_id)
+
+    def _parse(self, line: str, previous: float):
+        match = _LINE_RE.match(line)
+        if not match:
+            return previous, None, set(_TOKEN_RE.findall(line.lower()))
+        level, stamp, text = match.groups()
+        try:
+            timestamp = datetime.strptime(stamp, self._date_format).timestamp()
+        except ValueError:
+            timestamp = previous
+        # Время держится неубывающим, чтобы по нему работал двоичный поиск
+        return max(timestamp, previous), level, set(_TOKEN_RE.findall(text.lower()))
+
+    def update(self) -> int:
+        try:
+            size = os.path.getsize(self._log_path)
+        except OSError:
+            return 0
+
+        with open(self._log_path, 'rb') as log:
+            head = log.read(_HEAD_SIZE).hex()
+            rotated = size < self._indexed_bytes or not head.startswith(self._head)
+            if rotated:
+                self._reset()
+                if os.path.exists(self._index_path):
+                    os.remove(self._index_path)
+            if size == self._indexed_bytes:
+                return 0
+
+            log.seek(self._indexed_bytes)
+            data = log.read(size - self._indexed_bytes)
+
+        # Последняя строка может быть ещё не дописана, её разберём в следующий раз
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return 0
+
+        previous = self._timestamps[-1] if self._timestamps else 0.0
+        offset = self._indexed_bytes
+        entries = []
+        for raw in data[:end].splitlines(keepends=True):
+            line = raw.decode('utf-8', errors='replace').rstrip("\n")
+            timestamp, level, tokens = self._parse(line, previous)
+            previous = timestamp
+            self._add(offset, timestamp, level, tokens)
+            entries.append(json.dumps([offset, timestamp, level, sorted(tokens)], ensure_ascii=False))
+            offset += len(raw)
+
+        with open(self._index_path, 'a', encoding='utf-8') as f:
+            f.write("\n".join(entries) + "\n")
+        self._indexed_bytes = offset
+        self._head = head if len(head) >= len(self._head) else self._head
+        with open(self._meta_path, 'w', encoding='utf-8') as f:
+            json.dump({"indexed_bytes": self._indexed_bytes, "head": self._head}, f)
+        return len(entries)
+
+    @staticmethod
+    def _to_timestamp(value: Union[datetime, float, None]) -> Optional[float]:
+        if isinstance(value, datetime):
+            return value.timestamp()
+        return value
+
+    @staticmethod
+    def _message(line: str) -> str:
+        # contains ищется только в тексте сообщения, как и слова в индексе
+        match = _LINE_RE.match(line)
+        return match.group(3) if match else line
+
+    def _token_postings(self, needle: str) -> List[List[int]]:
+        # Слово, ограниченное внутри подстроки с обеих сторон, ищется в индексе
+        # целиком. Крайние слова могут быть частью более длинного слова в записи
+        # ("user" в "username"), для них объединяются списки всех слов словаря,
+        # которые кончаются на фрагмент, начинаются с него или содержат его.
+        postings = []
+        for m in _TOKEN_RE.finditer(needle):
+            fragment = m.group()
+            left_open, right_open = m.start() == 0, m.end() == len(needle)
+            if not left_open and not right_open:
+                postings.append(self._tokens.get(fragment, []))
+                continue
+            if left_open and right_open:
+                matches = lambda token: fragment in token
+            elif left_open:
+                matches = lambda token: token.endswith(fragment)
+            else:
+                matches = lambda token: token.startswith(fragment)
+            ids = set()
+            for token, token_ids in self._tokens.items():
+                if matches(token):
+                    ids.update(token_ids)
+            postings.append(sorted(ids))
+        return postings
+
+    def _candidates(self, level, since, until, contains) -> List[int]:
+        lo = 0 if since is None else bisect.bisect_left(self._timestamps, since)
+        hi = len(self._offsets) if until is None else bisect.bisect_right(self._timestamps, until)
+        if lo >= hi:
+            return []
+
+        postings = []
+        if level is not None:
+            postings.append(self._levels.get(level.value if isinstance(level, LogLevel) else level, []))
+        if contains:
+            postings.extend(self._token_postings(contains.lower()))
+        if not postings:
+            return list(range(lo, hi))
+
+        # Пересекаем списки, начиная с самого короткого, в окне [lo, hi)
+        postings.sort(key=len)
+        first = postings[0]
+        result = first[bisect.bisect_left(first, lo):bisect.bisect_left(first, hi)]
+        for other in postings[1:]:
+            other_set = set(other[bisect.bisect_left(other, lo):bisect.bisect_left(other, hi)])
+            result = [i for i in result if i in other_set]
+        return result
+
+    def query(self, level: Union[LogLevel, str, None] = None,
+              since: Union[datetime, float, None] = None,
+              until: Union[datetime, float, None] = None,
+              contains: Optional[str] = None) -> List[str]:
+        self.update()
+        ids = self._candidates(level, self._to_timestamp(since), self._to_timestamp(until), contains)
+        if not ids:
+            return []
+
+        lines = []
+        needle = contains.lower() if contains else None
+        with open(self._log_path, 'rb') as log:
+            run_start = 0
+            # Соседние записи читаются одним куском
+            for k in range(1, len(ids) + 1):
+                if k < len(ids) and ids[k] == ids[k - 1] + 1:
+                    continue
+                first, last = ids[run_start], ids[k - 1]
+                begin = self._offsets[first]
+                end = self._offsets[last + 1] if last + 1 < len(self._offsets) else self._indexed_bytes
+                log.seek(begin)
+                for raw in log.read(end - begin).splitlines():
+                    line = raw.decode('utf-8', errors='replace')
+                    if needle is None or needle in self._message(line).lower():
+                        lines.append(line)
+                run_start = k
+        return lines
+
+
+def demonstrate_log_index():
+    directory = tempfile.mkdtemp()
+    log_path = os.path.join(directory, "app.log")
+    try:
+        with open(log_path, 'w', encoding='utf-8') as f:
+            f.write("[INFO] [18.10.2026 10:00:00] username changed\n"
+                    "[ERROR] [18.10.2026 10:00:01] Unauthorised user 1001 attempted login.\n"
+                    "[WARN] [18.10.2026 10:00:02] Low system memory warning.\n")
+        index = LogIndex(log_path)
+        assert len(index.query(contains="user")) == 2
+        assert len(index.query(contains="user 10")) == 1
+        assert len(index.query(contains="sed")) == 1
+        assert index.query(level=LogLevel.WARN) == ["[WARN] [18.10.2026 10:00:02] Low system memory warning."]
+        assert len(index.query(since=datetime(2026, 10, 18, 10, 0, 1))) == 2
+        print("Тест пройден: запросы по уровню, времени и подстроке")
+
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write("[INFO] [18.10.2026 10:00:03] user logged out\n")
+        assert index.update() == 1 and len(index) == 4
+        # Падение между дописыванием .idx и записью .meta
+        with open(index._meta_path, 'r', encoding='utf-8') as f:
+            meta = f.read()
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write("[INFO] [18.10.2026 10:00:04] system idle\n")
+        index.update()
+        with open(index._meta_path, 'w', encoding='utf-8') as f:
+            f.write(meta)
+        reloaded = LogIndex(log_path)
+        assert len(reloaded) == 4
+        reloaded.update()
+        assert len(LogIndex(log_path)) == 5
+        print("Тест пройден: дописанные строки индексируются, неподтверждённые записи отрезаются")
+
+        with open(log_path, 'w', encoding='utf-8') as f:
+            f.write("[ERROR] [18.10.2026 11:00:00] rotated\n")
+        assert reloaded.query(contains="rotated") and len(reloaded) == 1
+        print("Тест пройден: после ротации индекс строится заново")
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Поиск по индексированному лог-файлу")
+    parser.add_argument("log", nargs="?", help="путь к лог-файлу; без него запускается проверка")
+    parser.add_argument("--date-format", default="%d.%m.%Y %H:%M:%S")
+    parser.add_argument("--level", choices=[level.value for level in LogLevel])
+    parser.add_argument("--since", help="начало окна в формате --date-format")
+    parser.add_argument("--until", help="конец окна в формате --date-format")
+    parser.add_argument("--contains", help="подстрока сообщения")
+    args = parser.parse_args()
+    if args.log is None:
+        demonstrate_log_index()
+        return
+
+    parse = lambda value: datetime.strptime(value, args.date_format) if value else None
+    index = LogIndex(args.log, args.date_format)
+    for line in index.query(args.level, parse(args.since), parse(args.until), args.contains):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,33 @@
 from enum import Enum
-from typing import Protocol, List
+from typing import Callable, Dict, Optional, Protocol, List, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import re
 from datetime import date, datetime
 import os 
+import random
+import asyncio
+import atexit
+import glob
+import gzip
+import multiprocessing
+import multiprocessing.util
+import shutil
+import tempfile
+import queue
+import threading
+import time
 
 
 class LogLevel(Enum):
     INFO = "INFO"
     WARN = "WARN"
     ERROR = "ERROR"
+
+class OverflowPolicy(Enum):
+    BLOCK = "BLOCK"
+    DROP_OLDEST = "DROP_OLDEST"
+    DROP_NEWEST = "DROP_NEWEST"
     
 class ILogFilter(Protocol):
     def match(self, log_level: LogLevel, text: str) -> bool:
@@ -18,6 +37,10 @@ class ILogHandler(Protocol):
     def handle(self, log_level: LogLevel, text: str) -> None:
         ...
 
+class IAsyncLogHandler(Protocol):
+    async def ahandle(self, log_level: LogLevel, text: str) -> None:
+        ...
+
 class ILogFormatter(Protocol):
     def format(self, log_level: LogLevel, text: str) -> str:
         ...
@@ -52,10 +75,240 @@ class LevelFilter:
     def match(self, log_level: LogLevel, text: str) -> bool:
         return self._levels_order[log_level] >= self._min_level_value
 
+_TEMPLATE_RE = re.compile(r"\d+")
+
+
+class TokenBucketFilter:
+    def __init__(self, rate: float, burst: int, per_template: bool = False, max_keys: int = 1024):
+        self._rate = rate
+        self._burst = burst
+        self._per_template = per_template
+        self._max_keys = max_keys
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def match(self, log_level: LogLevel, text: str) -> bool:
+        # Шаблон сообщения - текст с заменой чисел, так "user 17" и "user 42" делят одно ведро
+        key = (log_level, _TEMPLATE_RE.sub("#", text)) if self._per_template else log_level
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self._burst), now]
+                if len(self._buckets) > self._max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self._burst, bucket[0] + (now - bucket[1]) * self._rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True
+            return False
+
+class SamplingFilter:
+    def __init__(self, probability: float, levels: Optional[List[LogLevel]] = None, seed: Optional[int] = None):
+        self._probability = probability
+        self._levels = set(levels) if levels else None
+        self._random = random.Random(seed)
+
+    def match(self, log_level: LogLevel, text: str) -> bool:
+        if self._levels is not None and log_level not in self._levels:
+            return True
+        return self._random.random() < self._probability
+
+class DuplicateFilter:
+    def __init__(self, summary: Optional[Callable[[LogLevel, str], None]] = None):
+        self.summary = summary
+        self._last: Optional[Tuple[LogLevel, str]] = None
+        self._repeats = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def match(self, log_level: LogLevel, text: str) -> bool:
+        # Сводка сама проходит через Logger, её пропускаем без учёта
+        if getattr(self._local, "emitting", False):
+            return True
+        record = (log_level, text)
+        with self._lock:
+            if record == self._last:
+                self._repeats += 1
+                return False
+            pending = (self._last, self._repeats)
+            self._last = record
+            self._repeats = 0
+        self._emit(*pending)
+        return True
+
+    def flush(self) -> None:
+        with self._lock:
+            pending = (self._last, self._repeats)
+            self._repeats = 0
+        self._emit(*pending)
+
+    def _emit(self, record: Optional[Tuple[LogLevel, str]], repeats: int) -> None:
+        if not repeats or record is None or self.summary is None:
+            return
+        self._local.emitting = True
+        try:
+            self.summary(record[0], f"Повторов предыдущего сообщения: {repeats} ({record[1]})")
+        finally:
+            self._local.emitting = False
+
+# Фильтры разбираются один раз при создании Logger: сначала сравнение уровня,
+# затем подстроки по одному приведению текста к нижнему регистру, затем
+# регулярные выражения и в конце прочие фильтры в исходном порядке.
+class CompiledFilterChain:
+    def __init__(self, filters: List[ILogFilter]):
+        self._filters = list(filters)
+        self._rejects = [0] * len(self._filters)
+
+        self._levels_order = None
+        self._min_level_value = 0
+        self._level_index = -1
+        self._substrings: List[Tuple[str, int]] = []
+        self._regexes = []
+        self._others = []
+
+        seen_substrings = set()
+        seen_regexes = set()
+        for i, f in enumerate(self._filters):
+            # Подклассы могут переопределять match, поэтому разбираются только
+            # сами классы, а подклассы проверяются как обычные фильтры
+            if type(f) is LevelFilter:
+                self._levels_order = f._levels_order
+                if f._min_level_value > self._min_level_value:
+                    self._min_level_value = f._min_level_value
+                    self._level_index = i
+            elif type(f) is SimpleLogFilter:
+                if f._pattern not in seen_substrings:
+                    seen_substrings.add(f._pattern)
+                    self._substrings.append((f._pattern, i))
+            elif type(f) is ReLogFilter:
+                compiled = f._compiled_pattern
+                if (compiled.pattern, compiled.flags) not in seen_regexes:
+                    seen_regexes.add((compiled.pattern, compiled.flags))
+                    self._regexes.append((compiled.search, i))
+            else:
+                self._others.append((f.match, i))
+
+        # Более длинные подстроки встречаются реже и отсекают запись раньше
+        self._substrings.sort(key=lambda item: len(item[0]), reverse=True)
+
+    # С metrics каждый шаг цепочки замеряется отдельно, без него проверки те же
+    def match_level(self, log_level: LogLevel, metrics: Optional['PipelineMetrics'] = None) -> bool:
+        if metrics is not None and self._level_index >= 0:
+            mark = time.perf_counter_ns()
+            ok = self.match_level(log_level)
+            metrics.lap(self.stage_name(self._level_index), mark)
+            return ok
+        if self._levels_order is not None and self._levels_order[log_level] < self._min_level_value:
+            self._rejects[self._level_index] += 1
+            return False
+        return True
+
+    def match_text(self, log_level: LogLevel, text: str, metrics: Optional['PipelineMetrics'] = None) -> bool:
+        mark = time.perf_counter_ns() if metrics is not None else 0
+        if self._substrings:
+            lowered = text.lower()
+            if metrics is not None:
+                mark = metrics.lap("filters lower()", mark)
+            for pattern, i in self._substrings:
+                ok = pattern in lowered
+                if metrics is not None:
+                    mark = metrics.lap(self.stage_name(i), mark)
+                if not ok:
+                    self._rejects[i] += 1
+                    return False
+        for search, i in self._regexes:
+            ok = search(text)
+            if metrics is not None:
+                mark = metrics.lap(self.stage_name(i), mark)
+            if not ok:
+                self._rejects[i] += 1
+                return False
+        for match, i in self._others:
+            ok = match(log_level, text)
+            if metrics is not None:
+                mark = metrics.lap(self.stage_name(i), mark)
+            if not ok:
+                self._rejects[i] += 1
+                return False
+        return True
+
+    def match(self, log_level: LogLevel, text: str) -> bool:
+        return self.match_level(log_level) and self.match_text(log_level, text)
+
+    def stage_name(self, index: int) -> str:
+        return _stage_name("filter", index, self._filters[index])
+
+    def reject_counts(self) -> List[Tuple[ILogFilter, int]]:
+        return list(zip(self._filters, self._rejects))
+
+def _stage_name(kind: str, index: int, stage) -> str:
+    return f"{kind}[{index}] {type(stage).__name__}"
+
+# Гистограмма задержек по степеням двойки наносекунд: запись - O(1), память ограничена
+class LatencyHistogram:
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self._buckets = [0] * 64
+
+    def record(self, ns: int) -> None:
+        self.calls += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self._buckets[min(ns.bit_length(), 63)] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "total_ns": self.total_ns,
+            "avg_ns": self.total_ns / self.calls if self.calls else 0.0,
+            "max_ns": self.max_ns,
+            "buckets": {f"<{1 << i}ns": count for i, count in enumerate(self._buckets) if count},
+        }
+
+class PipelineMetrics:
+    def __init__(self):
+        self._stages: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, ns: int) -> None:
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = LatencyHistogram()
+            histogram.record(ns)
+
+    # Записывает время от mark до текущего момента и возвращает новую отметку
+    def lap(self, stage: str, mark: int) -> int:
+        self.record(stage, time.perf_counter_ns() - mark)
+        return time.perf_counter_ns()
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {stage: histogram.snapshot() for stage, histogram in self._stages.items()}
+
 class ConsoleHandler:
     def handle(self, log_level: LogLevel, text: str) -> None:
         print(text)
 
+# Запасной путь для файловых обработчиков: если запись не удалась, сломанный
+# файл закрывается, чтобы не держать дескриптор, а данные пишутся в базовый файл
+def _write_fallback(data: str, failed=None) -> None:
+    if failed is not None:
+        try:
+            failed.close()
+        except OSError:
+            pass
+    with open("default_logs.txt", 'a', encoding='utf-8') as f:
+        f.write(data)
+
+
 class FileHandler:
     def __init__(self, filename: str):
         self._filename = filename
@@ -65,17 +318,315 @@ class FileHandler:
             with open(self._filename, 'a', encoding='utf-8') as f:
                 f.write(text + '\n')
         except:
-            with open("default_logs.txt", 'a', encoding='utf-8') as f:
-                f.write(text + '\n')
-            repr("Ошибка при чтении/создании файла, создан базовый файл")
+            _write_fallback(text + '\n')
+
+
+class BufferedFileHandler:
+    def __init__(self, filename: str, max_records: int = 100, flush_interval: float = 1.0):
+        self._filename = filename
+        self._max_records = max_records
+        self._flush_interval = flush_interval
+        self._file = None
+        self._buffer: List[str] = []
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="BufferedFileHandler", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def handle(self, log_level: LogLevel, text: str) -> None:
+        with self._buffer_lock:
+            self._buffer.append(text)
+            full = len(self._buffer) >= self._max_records
+        if full:
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._buffer_lock:
+                records, self._buffer = self._buffer, []
+            if not records:
+                return
+            data = "\n".join(records) + "\n"
+            try:
+                if self._file is None:
+                    self._file = open(self._filename, 'a', encoding='utf-8')
+                self._file.write(data)
+                self._file.flush()
+            except:
+                _write_fallback(data, self._file)
+                self._file = None
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        atexit.unregister(self.close)
+
+
+class RotatingFileHandler:
+    _STOP = object()
+
+    def __init__(self, filename: str, max_bytes: int = 0, interval: float = 0.0, backup_count: int = 5):
+        self._filename = filename
+        self._max_bytes = max_bytes
+        self._interval = interval
+        self._backup_count = backup_count
+        self._lock = threading.Lock()
+        self._file = None
+        self._size = 0
+        self._opened_at = time.time()
+        self._open()
+        self._closed = False
+        self._compress_queue = queue.Queue()
+        self._compressor = threading.Thread(target=self._compress_loop, name="RotatingFileHandler", daemon=True)
+        self._compressor.start()
+        atexit.register(self.close)
+
+    def _open(self) -> None:
+        self._file = open(self._filename, 'a', encoding='utf-8')
+        self._size = self._file.tell()
+        self._opened_at = time.time()
+
+    def handle(self, log_level: LogLevel, text: str) -> None:
+        data = text + '\n'
+        size = len(data.encode('utf-8'))
+        with self._lock:
+            try:
+                if self._file is None:
+                    self._open()
+                if self._should_rollover(size):
+                    self._rollover()
+                self._file.write(data)
+                self._file.flush()
+                self._size += size
+            except:
+                _write_fallback(data, self._file)
+                self._file = None
+
+    def _should_rollover(self, size: int) -> bool:
+        if self._max_bytes and self._size > 0 and self._size + size > self._max_bytes:
+            return True
+        return bool(self._interval) and time.time() - self._opened_at >= self._interval
+
+    def _rollover(self) -> None:
+        self._file.close()
+        # Имя сегмента содержит время ротации, поэтому сортировка по имени совпадает с возрастом
+        rotated = f"{self._filename}.{datetime.now():%Y%m%d-%H%M%S-%f}"
+        os.replace(self._filename, rotated)
+        self._open()
+        self._compress_queue.put(rotated)
+
+    def _compress_loop(self) -> None:
+        while True:
+            path = self._compress_queue.get()
+            if path is self._STOP:
+                return
+            try:
+                with open(path, 'rb') as src, gzip.open(path + '.gz', 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(path)
+                self._prune()
+            except OSError:
+                pass
+
+    def _prune(self) -> None:
+        segments = sorted(glob.glob(glob.escape(self._filename) + ".*.gz"))
+        for path in segments[:max(len(segments) - self._backup_count, 0)]:
+            os.remove(path)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        self._compress_queue.put(self._STOP)
+        self._compressor.join()
+        atexit.unregister(self.close)
+
+
+# Запись в файл без блокировки цикла событий: записи за один проход цикла
+# собираются в пачку, и пачка пишется одним вызовом в отдельном потоке.
+# Вне цикла событий (обычный log из другого потока) пишет сразу.
+class AsyncFileHandler:
+    def __init__(self, filename: str, executor: Optional[ThreadPoolExecutor] = None):
+        self._filename = filename
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncFileHandler")
+        self._file = None
+        self._write_lock = threading.Lock()
+        self._buffer: List[str] = []
+        self._flushing: Optional[asyncio.Task] = None
+        self.batches = 0
+
+    async def ahandle(self, log_level: LogLevel, text: str) -> None:
+        self._buffer.append(text)
+        if self._flushing is None:
+            self._flushing = asyncio.get_running_loop().create_task(self._flush_batches())
+
+    def handle(self, log_level: LogLevel, text: str) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(text + "\n")
+            return
+        self._buffer.append(text)
+        if self._flushing is None:
+            self._flushing = loop.create_task(self._flush_batches())
+
+    async def _flush_batches(self) -> None:
+        # Задача стартует на следующем проходе цикла, когда пачка уже собрана
+        loop = asyncio.get_running_loop()
+        try:
+            while self._buffer:
+                records, self._buffer = self._buffer, []
+                self.batches += 1
+                await loop.run_in_executor(self._executor, self._write, "\n".join(records) + "\n")
+        finally:
+            self._flushing = None
+
+    def _write(self, data: str) -> None:
+        with self._write_lock:
+            try:
+                if self._file is None:
+                    self._file = open(self._filename, 'a', encoding='utf-8')
+                self._file.write(data)
+                self._file.flush()
+            except:
+                _write_fallback(data, self._file)
+                self._file = None
+
+    async def aflush(self) -> None:
+        while self._flushing is not None:
+            await asyncio.shield(self._flushing)
+
+    async def aclose(self) -> None:
+        await self.aflush()
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close_file)
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+    def _close_file(self) -> None:
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# Обработчик для рабочих процессов: отформатированные записи копятся пачками
+# и отправляются в общую очередь, которую разбирает LogAggregator.
+class AggregatorHandler:
+    def __init__(self, log_queue, batch_size: int = 64, flush_interval: float = 0.5):
+        self._queue = log_queue
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._batch: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="AggregatorHandler", daemon=True)
+        self._thread.start()
+        # Finalize срабатывает и при выходе процесса из пула, где atexit не вызывается.
+        # Очередь регистрирует своё закрытие с exitpriority=10, а финализаторы с
+        # большим приоритетом выполняются раньше - последняя пачка успеет уйти
+        self._finalizer = multiprocessing.util.Finalize(self, self.close, exitpriority=100)
+
+    def handle(self, log_level: LogLevel, text: str) -> None:
+        with self._lock:
+            self._batch.append((log_level.value, text))
+            full = len(self._batch) >= self._batch_size
+        if full:
+            self.flush()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self._flush_interval)
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._batch = self._batch, []
+            if batch:
+                self._queue.put(batch)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+
+
+class LogAggregator:
+    def __init__(self, handlers: List[ILogHandler], context=None):
+        self._handlers = handlers
+        self.queue = (context or multiprocessing.get_context()).Queue()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def handler(self, batch_size: int = 64, flush_interval: float = 0.5) -> AggregatorHandler:
+        return AggregatorHandler(self.queue, batch_size, flush_interval)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._listen, name="LogAggregator", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self.queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _listen(self) -> None:
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                return
+            for level_value, text in batch:
+                log_level = LogLevel(level_value)
+                for handler in self._handlers:
+                    handler.handle(log_level, text)
 
 
 class BasicLogFormatter:
     def __init__(self, date_format : str = "%d.%m.%Y %H:%M:%S"):
         self._date_format = date_format
+        # Метка времени пересчитывается раз в секунду, а с %f в формате - раз в миллисекунду
+        self._ticks_per_second = 1000 if "%f" in date_format else 1
+        self._cache = (None, "")
 
     def format(self, log_level: LogLevel, text: str) -> str:
-        timestamp = datetime.now().strftime(self._date_format)
+        now = time.time()
+        tick = int(now * self._ticks_per_second)
+        cached_tick, timestamp = self._cache
+        if tick != cached_tick:
+            timestamp = datetime.fromtimestamp(now).strftime(self._date_format)
+            self._cache = (tick, timestamp)
         formatted_text = f"[{log_level.value}] [{timestamp}] {text}"
         return formatted_text
         
@@ -85,39 +636,236 @@ class Logger:
         self,
         filters: List[ILogFilter],
         formatters: List[ILogFormatter],
-        handlers: List[ILogHandler]
+        handlers: List[ILogHandler],
+        instrument: bool = False
     ):
         self._filters = filters
+        self._filter_chain = CompiledFilterChain(filters)
         self._formatters = formatters
         self._handlers = handlers
+        self._metrics: Optional[PipelineMetrics] = PipelineMetrics() if instrument else None
+        self._dump_stop: Optional[threading.Event] = None
     
-    def log(self, log_level: LogLevel, text: str) -> None:
-        if not all(f.match(log_level, text) for f in self._filters):
+    def log(self, log_level: LogLevel, text: str, *args) -> None:
+        metrics = self._metrics
+        started = time.perf_counter_ns() if metrics is not None else 0
+        formatted_text = self._format_record(log_level, text, args, metrics)
+        if formatted_text is not None:
+            self._handle(log_level, formatted_text, metrics)
+        if metrics is not None:
+            metrics.lap("log", started)
+
+    def _handle(self, log_level: LogLevel, formatted_text: str, metrics: Optional[PipelineMetrics]) -> None:
+        if metrics is None:
+            for handler in self._handlers:
+                handler.handle(log_level, formatted_text)
             return
+        mark = time.perf_counter_ns()
+        for i, handler in enumerate(self._handlers):
+            handler.handle(log_level, formatted_text)
+            mark = metrics.lap(_stage_name("handler", i, handler), mark)
+
+    # Фильтры, подстановка аргументов и форматтеры; None - запись отброшена
+    def _format_record(self, log_level: LogLevel, text: str, args: tuple,
+                       metrics: Optional[PipelineMetrics]) -> Optional[str]:
+        if not self._filter_chain.match_level(log_level, metrics):
+            return None
+        if args:
+            text = text % args
+        if not self._filter_chain.match_text(log_level, text, metrics):
+            return None
+
+        mark = time.perf_counter_ns() if metrics is not None else 0
+        for i, formatter in enumerate(self._formatters):
+            text = formatter.format(log_level, text, )
+            if metrics is not None:
+                mark = metrics.lap(_stage_name("formatter", i, formatter), mark)
+        return text
+
+    def enable_metrics(self) -> None:
+        if self._metrics is None:
+            self._metrics = PipelineMetrics()
+
+    def disable_metrics(self) -> None:
+        self.stop_metrics_dump()
+        self._metrics = None
+
+    def metrics_snapshot(self) -> Dict[str, dict]:
+        return self._metrics.snapshot() if self._metrics is not None else {}
+
+    def start_metrics_dump(self, interval: float, sink: Callable[[Dict[str, dict]], None] = print) -> None:
+        self.enable_metrics()
+        self.stop_metrics_dump()
+        stop = self._dump_stop = threading.Event()
 
-        formatted_text = text
-        for formatter in self._formatters:
-            formatted_text = formatter.format(log_level, formatted_text, )
+        def dump():
+            while not stop.wait(interval):
+                sink(self.metrics_snapshot())
 
+        threading.Thread(target=dump, name="LoggerMetricsDump", daemon=True).start()
+
+    def stop_metrics_dump(self) -> None:
+        if self._dump_stop is not None:
+            self._dump_stop.set()
+            self._dump_stop = None
+
+    # Фильтры и форматтеры выполняются прямо в цикле событий, обработчики с
+    # ahandle ожидаются, обычные вызываются через handle
+    async def alog(self, log_level: LogLevel, text: str, *args) -> None:
+        metrics = self._metrics
+        started = time.perf_counter_ns() if metrics is not None else 0
+        formatted_text = self._format_record(log_level, text, args, metrics)
+        if formatted_text is not None:
+            mark = time.perf_counter_ns() if metrics is not None else 0
+            for i, handler in enumerate(self._handlers):
+                ahandle = getattr(handler, "ahandle", None)
+                if ahandle is None:
+                    handler.handle(log_level, formatted_text)
+                else:
+                    await ahandle(log_level, formatted_text)
+                if metrics is not None:
+                    mark = metrics.lap(_stage_name("handler", i, handler), mark)
+        if metrics is not None:
+            metrics.lap("alog", started)
+
+    async def alog_info(self, text: str, *args) -> None:
+        await self.alog(LogLevel.INFO, text, *args)
+
+    async def alog_warn(self, text: str, *args) -> None:
+        await self.alog(LogLevel.WARN, text, *args)
+
+    async def alog_error(self, text: str, *args) -> None:
+        await self.alog(LogLevel.ERROR, text, *args)
+
+    async def aflush(self) -> None:
         for handler in self._handlers:
-            handler.handle(log_level, formatted_text)
+            aflush = getattr(handler, "aflush", None)
+            if aflush is not None:
+                await aflush()
+
+    def log_info(self, text: str, *args) -> None:
+        self.log(LogLevel.INFO, text, *args)
+
+    def log_warn(self, text: str, *args) -> None:
+        self.log(LogLevel.WARN, text, *args)
 
-    def log_info(self, text: str) -> None:
-        self.log(LogLevel.INFO, text)
+    def log_error(self, text: str, *args) -> None:
+        self.log(LogLevel.ERROR, text, *args)
 
-    def log_warn(self, text: str) -> None:
-        self.log(LogLevel.WARN, text)
+    def reject_counts(self) -> List[Tuple[ILogFilter, int]]:
+        return self._filter_chain.reject_counts()
 
-    def log_error(self, text: str) -> None:
-        self.log(LogLevel.ERROR, text)
+
+class QueueLogger(Logger):
+    _POLL_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        filters: List[ILogFilter],
+        formatters: List[ILogFormatter],
+        handlers: List[ILogHandler],
+        max_size: int = 10000,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        instrument: bool = False
+    ):
+        super().__init__(filters, formatters, handlers, instrument)
+        self._queue = queue.Queue(maxsize=max_size)
+        self._overflow = overflow
+        self._counters_lock = threading.Lock()
+        self.dropped_oldest = 0
+        self.dropped_newest = 0
+        self.failed = 0
+        self._closed = False
+        self._stopping = threading.Event()
+        self._listener = threading.Thread(target=self._listen, name="QueueLogger", daemon=True)
+        self._listener.start()
+        atexit.register(self.close)
+
+    def log(self, log_level: LogLevel, text: str, *args) -> None:
+        if self._closed:
+            return
+        # Фильтры, подстановка аргументов и форматтеры выполняются в вызывающем
+        # потоке: в очередь попадает готовая строка, а не ссылки на объекты,
+        # которые вызывающий может изменить, и время в ней - время вызова log
+        formatted_text = self._format_record(log_level, text, args, self._metrics)
+        if formatted_text is None:
+            return
+        record = (log_level, formatted_text)
+        if self._overflow == OverflowPolicy.BLOCK:
+            # Ожидание с таймаутом: после close очередь больше никто не разбирает
+            while not self._closed:
+                try:
+                    self._queue.put(record, timeout=self._POLL_INTERVAL)
+                    return
+                except queue.Full:
+                    pass
+        elif self._overflow == OverflowPolicy.DROP_NEWEST:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                with self._counters_lock:
+                    self.dropped_newest += 1
+        else:
+            while True:
+                try:
+                    self._queue.put_nowait(record)
+                    return
+                except queue.Full:
+                    pass
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    with self._counters_lock:
+                        self.dropped_oldest += 1
+                except queue.Empty:
+                    pass
+
+    # Запись только кладётся в очередь; при OverflowPolicy.BLOCK и полной
+    # очереди это заблокирует цикл событий, для asyncio лучше DROP_*
+    async def alog(self, log_level: LogLevel, text: str, *args) -> None:
+        self.log(log_level, text, *args)
+
+    # Остановка по событию, а не по записи-маркеру в очереди: DROP_OLDEST
+    # мог бы вытеснить маркер, и поток никогда бы не завершился
+    def _listen(self) -> None:
+        while True:
+            try:
+                record = self._queue.get(timeout=self._POLL_INTERVAL)
+            except queue.Empty:
+                if self._stopping.is_set():
+                    return
+                continue
+            try:
+                log_level, formatted_text = record
+                self._handle(log_level, formatted_text, self._metrics)
+            except Exception:
+                with self._counters_lock:
+                    self.failed += 1
+            finally:
+                self._queue.task_done()
+
+    @property
+    def dropped(self) -> int:
+        return self.dropped_oldest + self.dropped_newest
+
+    @property
+    def queue_size(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._stopping.set()
+        self._listener.join()
+        atexit.unregister(self.close)
 
 
 def demonstrate_logger():
     LOG_FILENAME = "app_logs.txt"
-    
-    if os.path.exists(LOG_FILENAME):
-        os.remove(LOG_FILENAME)
-        
 
     level_filter = LevelFilter(LogLevel.INFO) 
     regex_filter = ReLogFilter(pattern=r'(user|\d{3}|system|\d{4}ms)')
@@ -125,7 +873,7 @@ def demonstrate_logger():
     formatter = BasicLogFormatter("%d-%m-%Y %H-%M-%S хаха тест форматтера")
 
     console_handler = ConsoleHandler()
-    file_handler = FileHandler(LOG_FILENAME)
+    file_handler = RotatingFileHandler(LOG_FILENAME, max_bytes=64 * 1024, backup_count=3)
 
     my_logger = Logger(
         filters=[level_filter, regex_filter], 
@@ -148,5 +896,162 @@ def demonstrate_logger():
     
     my_logger.log_error("It's Fine, HAHA NO!") 
 
+_worker_logger: Optional[Logger] = None
+
+def _init_aggregation_worker(log_queue) -> None:
+    global _worker_logger
+    _worker_logger = Logger([], [], [AggregatorHandler(log_queue, batch_size=10, flush_interval=60.0)])
+
+def _aggregation_job(worker: int) -> None:
+    for i in range(25):
+        _worker_logger.log_info("Процесс %d, запись %d", worker, i)
+
+# Обработчик для демонстраций: запоминает записи; с gate держит каждую запись,
+# пока событие не установлено, и отмечает в entered, что запись уже взята
+class _CollectingHandler:
+    def __init__(self, gate: Optional[threading.Event] = None):
+        self.records: List[str] = []
+        self.entered = threading.Event()
+        self._gate = gate
+
+    def handle(self, log_level: LogLevel, text: str) -> None:
+        self.entered.set()
+        if self._gate is not None:
+            self._gate.wait()
+        self.records.append(text)
+
+def demonstrate_aggregation():
+    # 8 заданий по 25 записей при пачке в 10: хвост из 5 записей уходит только при выходе процесса
+    for method in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context(method)
+        collector = _CollectingHandler()
+        with LogAggregator([collector], context) as aggregator:
+            pool = context.Pool(4, initializer=_init_aggregation_worker, initargs=(aggregator.queue,))
+            pool.map(_aggregation_job, range(8))
+            pool.close()
+            pool.join()
+        count = len(collector.records)
+        assert count == 8 * 25, f"{method}: дошло {count} из {8 * 25} записей"
+        print(f"Агрегация ({method}): дошли все {count} записей")
+
+def demonstrate_queue_logger():
+    # Обработчик держит запись 0, пока не открыт gate, поэтому из записей 1..19
+    # в очередь на 5 мест помещаются 5, а 14 отбрасываются по политике
+    for policy, kept in ((OverflowPolicy.DROP_NEWEST, range(1, 6)), (OverflowPolicy.DROP_OLDEST, range(15, 20))):
+        gate = threading.Event()
+        collector = _CollectingHandler(gate)
+        q_logger = QueueLogger([], [], [collector], max_size=5, overflow=policy)
+        q_logger.log_info("запись %d", 0)
+        collector.entered.wait()
+        for i in range(1, 20):
+            q_logger.log_info("запись %d", i)
+        assert q_logger.dropped == 14 and q_logger.queue_size == 5
+        gate.set()
+        q_logger.flush()
+        q_logger.close()
+        assert collector.records == [f"запись {i}" for i in [0, *kept]], collector.records
+        print(f"QueueLogger ({policy.name}): отброшено {q_logger.dropped}, записано {collector.records}")
+
+    collector = _CollectingHandler()
+    q_logger = QueueLogger([], [], [collector], max_size=5, overflow=OverflowPolicy.BLOCK)
+    for i in range(200):
+        q_logger.log_info("запись %d", i)
+    q_logger.flush()
+    q_logger.close()
+    assert q_logger.dropped == 0 and collector.records == [f"запись {i}" for i in range(200)]
+    q_logger.log_info("после close")
+    assert len(collector.records) == 200
+    print("QueueLogger (BLOCK): все 200 записей по порядку, после close запись игнорируется")
+
+def demonstrate_rotation():
+    # Запись "запись 000" занимает 17 байт, в файл на 100 байт входит 5 записей:
+    # 40 записей дают 7 ротаций, после сжатия остаются 2 последних сегмента,
+    # и вместе с текущим файлом в них ровно записи 25..39
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rotating.txt")
+        handler = RotatingFileHandler(path, max_bytes=100, backup_count=2)
+        for i in range(40):
+            handler.handle(LogLevel.INFO, f"запись {i:03d}")
+        handler.close()
+
+        segments = sorted(glob.glob(glob.escape(path) + ".*"))
+        assert len(segments) == 2 and all(name.endswith(".gz") for name in segments), segments
+        assert os.path.getsize(path) <= 100
+        tail = []
+        for segment in segments:
+            with gzip.open(segment, 'rt', encoding='utf-8') as f:
+                tail += f.read().splitlines()
+        with open(path, 'r', encoding='utf-8') as f:
+            tail += f.read().splitlines()
+        assert tail == [f"запись {i:03d}" for i in range(25, 40)], tail
+        print(f"Ротация: сегментов {len(segments)}, в них и в текущем файле последние {len(tail)} записей")
+
+def demonstrate_flood_filters():
+    # rate=0: ведро не пополняется, и проходят ровно burst записей
+    collector = _CollectingHandler()
+    limited = Logger([TokenBucketFilter(rate=0, burst=3)], [], [collector])
+    for i in range(10):
+        limited.log_info("запрос %d", i)
+    assert collector.records == ["запрос 0", "запрос 1", "запрос 2"]
+
+    # С per_template у каждого шаблона своё ведро: "user 7" и "user 8" делят одно
+    collector = _CollectingHandler()
+    limited = Logger([TokenBucketFilter(rate=0, burst=2, per_template=True)], [], [collector])
+    for i in range(5):
+        limited.log_info("user %d", i)
+        limited.log_info("disk %d", i)
+    assert collector.records == ["user 0", "disk 0", "user 1", "disk 1"]
+    print(f"TokenBucketFilter: {collector.records}")
+
+    collector = _CollectingHandler()
+    sampled = Logger([SamplingFilter(0.0, levels=[LogLevel.INFO])], [], [collector])
+    sampled.log_info("отладка")
+    sampled.log_error("ошибка")
+    assert collector.records == ["ошибка"]
+    collector = _CollectingHandler()
+    sampled = Logger([SamplingFilter(0.25, seed=7)], [], [collector])
+    for i in range(2000):
+        sampled.log_info("запрос %d", i)
+    assert 400 < len(collector.records) < 600
+    print(f"SamplingFilter(0.25): прошло {len(collector.records)} из 2000")
+
+    collector = _CollectingHandler()
+    duplicates = DuplicateFilter()
+    deduped = Logger([duplicates], [], [collector])
+    duplicates.summary = deduped.log
+    for _ in range(4):
+        deduped.log_warn("диск заполнен")
+    deduped.log_info("готово")
+    deduped.log_info("готово")
+    duplicates.flush()
+    assert collector.records == ["диск заполнен", "Повторов предыдущего сообщения: 3 (диск заполнен)",
+                                 "готово", "Повторов предыдущего сообщения: 1 (готово)"], collector.records
+    print(f"DuplicateFilter: {collector.records}")
+
+def demonstrate_async_logger():
+    # Все 50 вызовов alog выполняются за один проход цикла событий, поэтому
+    # AsyncFileHandler пишет их одной пачкой и в исходном порядке
+    async def run(path: str) -> int:
+        handler = AsyncFileHandler(path)
+        a_logger = Logger([], [], [handler])
+        await asyncio.gather(*(a_logger.alog_info("запрос %d", i) for i in range(50)))
+        await a_logger.aflush()
+        await handler.aclose()
+        return handler.batches
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "async_logs.txt")
+        batches = asyncio.run(run(path))
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    assert lines == [f"запрос {i}" for i in range(50)], lines
+    assert batches == 1, batches
+    print(f"alog + AsyncFileHandler: {len(lines)} записей, пачек {batches}")
+
 if __name__ == "__main__":
-    demonstrate_logger()
\ No newline at end of file
+    demonstrate_logger()
+    demonstrate_aggregation()
+    demonstrate_queue_logger()
+    demonstrate_rotation()
+    demonstrate_flood_filters()
+    demonstrate_async_logger()
\ No newline at end of file
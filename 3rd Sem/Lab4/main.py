@@ -1,13 +1,37 @@
 import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+
+# Открытые Scope всех инжекторов: у каждого потока и asyncio-задачи свои.
+# ContextVar один на модуль - контексты хранят все созданные переменные,
+# поэтому заводить её на каждый инжектор нельзя.
+_scopes = ContextVar("injector_scopes", default={})
+
+class ScopeState:
+    def __init__(self):
+        self.data = {}
+        self.token = None
 
 class Injector:
     def __init__(self):
         self.map = {}
         self.singletons = {}
-        self.scope_data = {}
-        self.is_scope_active = False
+        self.singleton_locks = {}
+        self.frozen = False
+
+    @property
+    def is_scope_active(self):
+        return id(self) in _scopes.get()
+
+    @property
+    def scope_data(self):
+        scope = _scopes.get().get(id(self))
+        return scope.data if scope is not None else {}
 
     def register(self, interface, target, life_circle="PerRequest", params=None):
+        if self.frozen:
+            raise RuntimeError(f"Ошибка: Контейнер заморожен, '{interface}' не зарегистрирован.")
         self.map[interface] = {
             "target": target,
             "style": life_circle,
@@ -24,8 +48,11 @@ class Injector:
         params = info["params"]
 
         if style == "Singleton":
+            # Двойная проверка: после создания объекта блокировка не берётся
             if interface not in self.singletons:
-                self.singletons[interface] = self.create_object(target, params)
+                with self.singleton_locks.setdefault(interface, threading.RLock()):
+                    if interface not in self.singletons:
+                        self.singletons[interface] = self.create_object(target, params)
             return self.singletons[interface]
 
         if style == "Scoped":
@@ -53,14 +80,71 @@ class Injector:
         except TypeError as e:
             raise TypeError(f"Ошибка в аргументах конструктора: {e}")
 
+    def dependencies(self, interface):
+        info = self.map[interface]
+        target = info["target"]
+        if callable(target) and not isinstance(target, type):
+            return []
+        return [value for value in info["params"].values() if isinstance(value, str) and value in self.map]
+
+    # Проверка графа без создания объектов: обход в глубину находит циклы,
+    # порядок выхода из вершин - топологический (зависимости раньше)
+    def freeze(self):
+        order = []
+        state = {}
+        for root in self.map:
+            if root in state:
+                continue
+            state[root] = "в обходе"
+            stack = [(root, iter(self.dependencies(root)))]
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    state[node] = "готов"
+                    order.append(node)
+                elif state.get(child) == "в обходе":
+                    path = [name for name, _ in stack]
+                    cycle = path[path.index(child):] + [child]
+                    raise RuntimeError(f"Ошибка: Циклическая зависимость {' -> '.join(cycle)}.")
+                elif child not in state:
+                    state[child] = "в обходе"
+                    stack.append((child, iter(self.dependencies(child))))
+        self.frozen = True
+        return order
+
+    # Заранее создаёт все Singleton: по уровням графа, уровень - параллельно
+    def build(self, parallel=True, max_workers=None):
+        order = self.freeze()
+        levels = {}
+        by_level = {}
+        for interface in order:
+            level = max((levels[d] + 1 for d in self.dependencies(interface)), default=0)
+            levels[interface] = level
+            if self.map[interface]["style"] == "Singleton":
+                by_level.setdefault(level, []).append(interface)
+
+        if not parallel:
+            for level in sorted(by_level):
+                for interface in by_level[level]:
+                    self.get_instance(interface)
+            return order
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for level in sorted(by_level):
+                for future in [pool.submit(self.get_instance, i) for i in by_level[level]]:
+                    future.result()
+        return order
+
     def __enter__(self):
-        self.is_scope_active = True
-        self.scope_data = {}
+        scope = ScopeState()
+        scope.token = _scopes.set({**_scopes.get(), id(self): scope})
         return self
 
+    # reset возвращает значение до входа: вложенный with восстанавливает внешний Scope
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.is_scope_active = False
-        self.scope_data = {}
+        _scopes.reset(_scopes.get()[id(self)].token)
 
 class Engine: pass
 class PetrolEngine: 
@@ -109,4 +193,39 @@ print("\n--- Проверка ошибок ---")
 try:
     inj1.get_instance("Car")
 except RuntimeError as e:
-    print(e)
\ No newline at end of file
+    print(e)
+
+print("\n--- Проверка потоков ---")
+cars = []
+def request():
+    with inj1:
+        cars.append((inj1.get_instance("Car"), inj1.get_instance("Car")))
+threads = [threading.Thread(target=request) for _ in range(8)]
+for t in threads: t.start()
+for t in threads: t.join()
+print(f"У каждого потока свой Scope: {len({id(a) for a, _ in cars}) == len(threads)}")
+print(f"Внутри потока объект один: {all(a is b for a, b in cars)}")
+print(f"Singleton общий: {len({id(a.engine) for a, _ in cars}) == 1}")
+
+with inj1:
+    outer = inj1.get_instance("Car")
+    with inj1:
+        inner = inj1.get_instance("Car")
+    print(f"Вложенный with восстанавливает внешний Scope: {inner is not outer and inj1.get_instance('Car') is outer}")
+
+print("\n--- Проверка freeze/build ---")
+inj4 = Injector()
+inj4.register("Car", CityCar, "PerRequest", {"engine": "Engine", "logger": "Logger"})
+inj4.register("Engine", PetrolEngine, "Singleton")
+inj4.register("Logger", ReleaseLogger, "Singleton")
+print(f"Порядок создания: {inj4.build()}")
+print(f"Singleton созданы заранее: {sorted(inj4.singletons)}")
+
+inj3 = Injector()
+inj3.register("Engine", CityCar, "PerRequest", {"engine": "Car", "logger": "Logger"})
+inj3.register("Logger", DebugLogger)
+inj3.register("Car", CityCar, "PerRequest", {"engine": "Engine", "logger": "Logger"})
+try:
+    inj3.freeze()
+except RuntimeError as e:
+    print(e)
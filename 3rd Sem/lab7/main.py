@@ -1,4 +1,8 @@
-from typing import Callable, Optional, Any, Type, Dict, List, get_type_hints
+from typing import Callable, Optional, Any, Type, Dict, List, Tuple, get_type_hints
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, Token
+import threading
+import time
 from enum import Enum
 from abc import ABC, abstractmethod
 
@@ -16,17 +20,28 @@ class DependencyResolutionError(DIError):
 class RegistrationError(DIError):
     pass
 
+# Стеки областей всех инжекторов, свои у каждого потока и asyncio-задачи.
+# Переменная одна на модуль: контексты держат все созданные ContextVar,
+# поэтому заводить её на каждый инжектор нельзя. Словарь не изменяется на
+# месте, а заменяется копией; запись инжектора удаляется при выходе из Scope.
+_scopes: ContextVar[Dict[int, Tuple[Dict[Any, Any], ...]]] = ContextVar("injector_scopes", default={})
+
 class Injector:
     def __init__(self) -> None:
         self.registered_interfaces: Dict[Any, dict] = {}
-        self._scope_stack: List[Dict[Any, Any]] = []
         self._singleton_instances: Dict[Any, Any] = {}
+        self._singleton_locks: Dict[Any, threading.RLock] = {}
+        self._plans: Dict[Any, Callable[[], Any]] = {}
+        self._frozen = False
 
     def register(self, interface: Any, 
                  class_or_factory: Any, 
                  lifestyle: LifeStyle = LifeStyle.PerRequest, 
                  params: Optional[Dict[str, Any]] = None) -> None:
         
+        if self._frozen:
+            raise RegistrationError("Ошибка регистрации: контейнер заморожен вызовом freeze()")
+
         if isinstance(class_or_factory, type):
             target = class_or_factory.__init__
             try:
@@ -50,29 +65,132 @@ class Injector:
             "lifestyle": lifestyle,
             "params": params if params else {}
         }
+        # Планы зависимых интерфейсов встроены друг в друга, поэтому сбрасываются все
+        self._plans.clear()
 
     def open_scope(self) -> 'Scope':
         return Scope(self)
     
-    def _push_scope(self) -> None:
-        self._scope_stack.append({})
+    @property
+    def _scope_stack(self) -> Tuple[Dict[Any, Any], ...]:
+        return _scopes.get().get(id(self), ())
+
+    def _push_scope(self) -> Token:
+        return _scopes.set({**_scopes.get(), id(self): self._scope_stack + ({},)})
 
-    def _pop_scope(self) -> None:
-        self._scope_stack.pop()
+    def _pop_scope(self, token: Optional[Token] = None) -> None:
+        if token is not None:
+            _scopes.reset(token)
+            return
+        stacks = dict(_scopes.get())
+        stack = stacks.pop(id(self), ())[:-1]
+        if stack:
+            stacks[id(self)] = stack
+        _scopes.set(stacks)
 
     def _current_scope(self) -> Optional[Dict]:
-        return self._scope_stack[-1] if self._scope_stack else None
+        scopes = self._scope_stack
+        return scopes[-1] if scopes else None
 
     def get_instance(self, interface_type: Any) -> Any:
+        plan = self._plans.get(interface_type)
+        if plan is None:
+            plan = self._compile(interface_type)
+        return plan()
+
+    def _dependencies(self, interface_type: Any) -> List[Any]:
         if interface_type not in self.registered_interfaces:
             raise DependencyResolutionError(f"Интерфейс {interface_type} не зарегистрирован")
+        reg = self.registered_interfaces[interface_type]
+        provider = reg["provider"]
+        target = provider.__init__ if isinstance(provider, type) else provider
+        try:
+            hints = get_type_hints(target)
+        except:
+            return []
+
+        dependencies = []
+        for name, arg_type in hints.items():
+            if name in ('return', 'self') or name in reg["params"]:
+                continue
+            if arg_type not in self.registered_interfaces:
+                raise DependencyResolutionError(
+                    f"Не удалось разрешить зависимость '{name}: {arg_type}'"
+                )
+            dependencies.append(arg_type)
+        return dependencies
+
+    # Граф зависимостей обходится в глубину: цикл сообщается с полным путём,
+    # а порядок выхода из вершин даёт топологический порядок (зависимости раньше)
+    def freeze(self) -> List[Any]:
+        order: List[Any] = []
+        state: Dict[Any, int] = {}
+        for root in self.registered_interfaces:
+            if root in state:
+                continue
+            state[root] = 1
+            stack: List[Tuple[Any, Any]] = [(root, iter(self._dependencies(root)))]
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    state[node] = 2
+                    order.append(node)
+                elif state.get(child) == 1:
+                    path = [n for n, _ in stack]
+                    raise DependencyResolutionError(
+                        f"Циклическая зависимость: {_cycle_repr(path[path.index(child):] + [child])}"
+                    )
+                elif child not in state:
+                    state[child] = 1
+                    stack.append((child, iter(self._dependencies(child))))
+
+        for interface_type in order:
+            if interface_type not in self._plans:
+                self._compile(interface_type)
+        self._frozen = True
+        return order
+
+    # Singleton-объекты создаются заранее по уровням графа: все зависимости
+    # уровня уже готовы, поэтому объекты одного уровня строятся параллельно
+    def build(self, parallel: bool = True, max_workers: Optional[int] = None) -> List[Any]:
+        order = self.freeze()
+        levels: Dict[Any, int] = {}
+        by_level: Dict[int, List[Any]] = {}
+        for interface_type in order:
+            level = max((levels[d] + 1 for d in self._dependencies(interface_type)), default=0)
+            levels[interface_type] = level
+            if self.registered_interfaces[interface_type]["lifestyle"] == LifeStyle.Singleton:
+                by_level.setdefault(level, []).append(interface_type)
+
+        if not parallel:
+            for level in sorted(by_level):
+                for interface_type in by_level[level]:
+                    self.get_instance(interface_type)
+            return order
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for level in sorted(by_level):
+                for future in [pool.submit(self.get_instance, i) for i in by_level[level]]:
+                    future.result()
+        return order
+
+    # Разбор type hints делается один раз: план - замыкание, которое сразу
+    # вызывает планы зависимостей и конструктор
+    def _compile(self, interface_type: Any, path: Tuple[Any, ...] = ()) -> Callable[[], Any]:
+        if interface_type not in self.registered_interfaces:
+            raise DependencyResolutionError(f"Интерфейс {interface_type} не зарегистрирован")
+        if interface_type in path:
+            cycle = list(path[path.index(interface_type):]) + [interface_type]
+            raise DependencyResolutionError(f"Циклическая зависимость: {_cycle_repr(cycle)}")
+        path = path + (interface_type,)
 
         reg = self.registered_interfaces[interface_type]
         provider = reg["provider"]
         manual_params = reg["params"]
         lifestyle = reg["lifestyle"]
 
-        constructor_args = {}
         target = provider.__init__ if isinstance(provider, type) else provider
         
         try:
@@ -80,42 +198,74 @@ class Injector:
         except:
             hints = {}
 
+        static_args = {}
+        dependencies = []
         for name, arg_type in hints.items():
             if name in ('return', 'self'): continue
             
             if name in manual_params:
-                constructor_args[name] = manual_params[name]
+                static_args[name] = manual_params[name]
             elif arg_type in self.registered_interfaces:
-                constructor_args[name] = self.get_instance(arg_type)
+                dependencies.append((name, self._plans.get(arg_type) or self._compile(arg_type, path)))
             else:
                 raise DependencyResolutionError(
                     f"Не удалось разрешить зависимость '{name}: {arg_type}'"
                 )
 
+        if dependencies:
+            def create() -> Any:
+                constructor_args = static_args.copy()
+                for name, dependency in dependencies:
+                    constructor_args[name] = dependency()
+                return provider(**constructor_args)
+        elif static_args:
+            def create() -> Any:
+                return provider(**static_args)
+        else:
+            create = provider
+
         if lifestyle == LifeStyle.PerRequest:
-            return provider(**constructor_args)
+            plan = create
         
         elif lifestyle == LifeStyle.Singleton:
-            if interface_type not in self._singleton_instances:
-                self._singleton_instances[interface_type] = provider(**constructor_args)
-            return self._singleton_instances[interface_type]
+            singletons = self._singleton_instances
+            lock = self._singleton_locks.setdefault(interface_type, threading.RLock())
+
+            # Двойная проверка: блокировка берётся только пока объект не создан
+            def plan() -> Any:
+                if interface_type not in singletons:
+                    with lock:
+                        if interface_type not in singletons:
+                            singletons[interface_type] = create()
+                return singletons[interface_type]
         
         elif lifestyle == LifeStyle.Scoped:
-            scope = self._current_scope()
-            if scope is None:
-                raise RuntimeError("Объект Scoped запрошен вне Scope")
-            if interface_type not in scope:
-                scope[interface_type] = provider(**constructor_args)
-            return scope[interface_type]
+            key = id(self)
+
+            def plan() -> Any:
+                scope_stack = _scopes.get().get(key, ())
+                if not scope_stack:
+                    raise RuntimeError("Объект Scoped запрошен вне Scope")
+                scope = scope_stack[-1]
+                if interface_type not in scope:
+                    scope[interface_type] = create()
+                return scope[interface_type]
+
+        self._plans[interface_type] = plan
+        return plan
+
+def _cycle_repr(cycle: List[Any]) -> str:
+    return " -> ".join(getattr(t, "__name__", str(t)) for t in cycle)
 
 class Scope:
     def __init__(self, injector: Injector) -> None:
         self.injector = injector
+        self._token: Optional[Token] = None
     def __enter__(self) -> Injector:
-        self.injector._push_scope()
+        self._token = self.injector._push_scope()
         return self.injector
     def __exit__(self, *args) -> None:
-        self.injector._pop_scope()
+        self.injector._pop_scope(self._token)
 
 class IBase(ABC):
     @abstractmethod
@@ -166,5 +316,54 @@ def run_tests():
         assert o1 is o2
     print("Тест пройден: Scoped сохраняет объект внутри контекста")
 
+    class OtherDependency(IDependency):
+        def work(self): return "другая работа"
+    assert inj.get_instance(IBase).action() == "работа выполнена"
+    inj.register(IDependency, OtherDependency)
+    assert inj.get_instance(IBase).action() == "другая работа"
+    print("Тест пройден: Повторная регистрация сбрасывает закэшированные планы")
+
+    class CycleA: pass
+    class CycleB: pass
+    def make_a(b: CycleB) -> CycleA: return CycleA()
+    def make_b(a: CycleA) -> CycleB: return CycleB()
+    cyclic = Injector()
+    cyclic.register(CycleB, CycleB)
+    cyclic.register(CycleA, make_a)
+    cyclic.register(CycleB, make_b)
+    try:
+        cyclic.freeze()
+        print("Тест провален: Цикл зависимостей не обнаружен")
+    except DependencyResolutionError as e:
+        print(f"Тест пройден: {e}")
+
+    class Slow:
+        created = 0
+        def __init__(self):
+            Slow.created += 1
+            time.sleep(0.01)
+    concurrent = Injector()
+    concurrent.register(Slow, Slow, lifestyle=LifeStyle.Singleton)
+    concurrent.register(ScopedObj, ScopedObj, lifestyle=LifeStyle.Scoped)
+    seen = []
+    def request():
+        with concurrent.open_scope() as s:
+            seen.append((s.get_instance(Slow), s.get_instance(ScopedObj)))
+    threads = [threading.Thread(target=request) for _ in range(16)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert Slow.created == 1
+    assert len({id(scoped) for _, scoped in seen}) == len(threads)
+    print("Тест пройден: Потоки получают свой Scope и один Singleton")
+
+    order = inj.build()
+    assert order.index(IDependency) < order.index(IBase)
+    assert inj._singleton_instances[Single] is inj.get_instance(Single)
+    try:
+        inj.register(TestClass, TestClass)
+        print("Тест провален: Регистрация после freeze()")
+    except RegistrationError:
+        print("Тест пройден: build() создал Singleton заранее и заморозил контейнер")
+
 if __name__ == "__main__":
     run_tests()
\ No newline at end of file